@@ -1,9 +1,12 @@
 """Admin page for system monitoring and maintenance."""
 
+import logging
+from functools import partial
+
 import streamlit as st
 import pandas as pd
 
-from src.database import get_all_bills, get_bill_items, delete_bill
+from src.database import get_all_bills, get_bill_items, get_items_for_bills, delete_bill
 from src.dashboard.exports import (
     export_csv,
     export_excel,
@@ -13,6 +16,49 @@ from src.dashboard.exports import (
     export_detailed_pdf,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _run_export(exporter, *args):
+    """Build an export file, logging any failure before re-raising it.
+
+    Exports run lazily when the download button is clicked, outside the page's
+    try/except, so failures are logged here instead of being lost.
+
+    Args:
+        exporter: Export function to call.
+        *args: DataFrames passed through to the exporter.
+
+    Returns:
+        File bytes produced by the exporter.
+    """
+    try:
+        return exporter(*args)
+    except Exception:
+        logger.exception("Export failed in %s", exporter.__name__)
+        raise
+
+
+def _load_all_items(bills):
+    """Fetch line items for every bill in one batched query.
+
+    Args:
+        bills: Bill dictionaries in display order.
+
+    Returns:
+        Line item dictionaries with a bill_id key, grouped in the same bill order.
+    """
+    bill_order = {bill.get("id"): pos for pos, bill in enumerate(bills)}
+    items = get_items_for_bills(list(bill_order))
+    # The batched query returns bills by ascending id; restore display order.
+    items.sort(key=lambda item: bill_order[item["bill_id"]])
+    # Drop the joined bill metadata so rows carry the get_bill_items columns
+    # (including the item id) plus bill_id.
+    return [
+        {key: value for key, value in item.items() if key not in ("vendor_name", "purchase_date")}
+        for item in items
+    ]
+
 
 def page_admin():
     """Render the admin dashboard with metrics, bill details, exports, and maintenance.
@@ -67,12 +113,13 @@ def page_admin():
         options_df["total_amount"], errors="coerce"
     ).fillna(0.0)
 
+    # itertuples yields plain namedtuples instead of boxing each row in a Series.
     option_labels = {
-        int(row["id"]): (
-            f"Bill #{int(row['id'])} • {row['vendor_name']} • "
-            f"{row['purchase_date']} • ${row['total_amount']:.2f}"
+        int(row.id): (
+            f"Bill #{int(row.id)} • {row.vendor_name} • "
+            f"{row.purchase_date} • ${row.total_amount:.2f}"
         )
-        for _, row in options_df.iterrows()
+        for row in options_df.itertuples(index=False)
     }
     # Bill picker based on readable labels.
     selected_bill_id = st.selectbox(
@@ -158,6 +205,13 @@ def page_admin():
 
     st.divider()
 
+    try:
+        # Load all line items once for detailed exports and the raw items tab.
+        all_items = _load_all_items(bills)
+    except Exception as exc:
+        st.error(f"Failed to load line items: {exc}")
+        all_items = []
+
     # Export section for summary and detailed outputs.
     st.subheader("📥 Export Bills")
 
@@ -195,39 +249,39 @@ def page_admin():
             for col in numeric_columns:
                 export_df[col] = pd.to_numeric(export_df[col], errors="coerce")
 
-            # Flatten all line items with bill IDs for detailed exports.
-            all_items = []
-            for bill in bills:
-                bill_id = bill.get("id")
-                for item in get_bill_items(bill_id) or []:
-                    all_items.append({**item, "bill_id": bill_id})
+            # Flattened line items with bill IDs for detailed exports.
             items_df = pd.DataFrame(all_items)
-
-            # Switch between detailed and summary exports.
+        except Exception as exc:
+            st.error(f"❌ Error preparing export data: {str(exc)}")
+        else:
+            # Switch between detailed and summary exports. The builder is passed
+            # uncalled: Streamlit runs it on its own thread only when the button
+            # is clicked, instead of rebuilding the file on every rerun. _run_export
+            # logs failures, since they happen outside this function.
             if export_type == "Detailed":
                 if export_format == "CSV":
-                    file_data = export_detailed_csv(export_df, items_df)
+                    file_data = partial(_run_export, export_detailed_csv, export_df, items_df)
                     file_name = "bills_detailed_export.csv"
                     mime_type = "text/csv"
                 elif export_format == "Excel":
-                    file_data = export_detailed_excel(export_df, items_df)
+                    file_data = partial(_run_export, export_detailed_excel, export_df, items_df)
                     file_name = "bills_detailed_export.xlsx"
                     mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 else:
-                    file_data = export_detailed_pdf(export_df, items_df)
+                    file_data = partial(_run_export, export_detailed_pdf, export_df, items_df)
                     file_name = "bills_detailed_export.pdf"
                     mime_type = "application/pdf"
             else:
                 if export_format == "CSV":
-                    file_data = export_csv(export_df)
+                    file_data = partial(_run_export, export_csv, export_df)
                     file_name = "bills_export.csv"
                     mime_type = "text/csv"
                 elif export_format == "Excel":
-                    file_data = export_excel(export_df)
+                    file_data = partial(_run_export, export_excel, export_df)
                     file_name = "bills_export.xlsx"
                     mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 else:
-                    file_data = export_pdf(export_df)
+                    file_data = partial(_run_export, export_pdf, export_df)
                     file_name = "bills_export.pdf"
                     mime_type = "application/pdf"
 
@@ -242,8 +296,6 @@ def page_admin():
                 use_container_width=True,
                 key="admin_export_download_button",
             )
-        except Exception as exc:
-            st.error(f"❌ Error preparing export: {str(exc)}")
 
     st.divider()
 
@@ -255,8 +307,8 @@ def page_admin():
 
     # Build delete dropdown labels.
     delete_options = {
-        int(row["id"]): f"Bill #{int(row['id'])} • {row['vendor_name']} • {row['purchase_date']}"
-        for _, row in bills_df.iterrows()
+        int(row.id): f"Bill #{int(row.id)} • {row.vendor_name} • {row.purchase_date}"
+        for row in bills_df[["id", "vendor_name", "purchase_date"]].itertuples(index=False)
     }
     # Delete selection and confirmation toggle.
     selected_delete_id = st.selectbox(
@@ -333,13 +385,6 @@ def page_admin():
     # Line items table tab.
     with tabs[1]:
         st.markdown("#### All Line Items (Raw)")
-        # Collect all line items across bills for inspection.
-        all_items = []
-        for bill in bills:
-            bill_id = bill.get("id")
-            for item in get_bill_items(bill_id) or []:
-                all_items.append({**item, "bill_id": bill_id})
-
         # Normalize and format line item numbers before display.
         if all_items:
             items_all_df = pd.DataFrame(all_items)
@@ -6,16 +6,17 @@ This file contains pure data-processing logic.
 No Streamlit UI code should exist here.
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
 # DATA PREPARATION
 
-def prepare_bills_dataframe(bills: list) -> pd.DataFrame:
+def prepare_bills_dataframe(bills) -> pd.DataFrame:
     """
-    Convert raw bills list into cleaned DataFrame.
+    Convert raw bills (list of dicts or DataFrame) into cleaned DataFrame.
     """
-    if not bills:
+    if bills is None or len(bills) == 0:
         return pd.DataFrame()
 
     df = pd.DataFrame(bills)
@@ -27,11 +28,44 @@ def prepare_bills_dataframe(bills: list) -> pd.DataFrame:
             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
     # Parse dates into a dedicated datetime column for time series views.
+    # Stored dates are ISO (YYYY-MM-DD); the format hint skips per-row inference.
     if "purchase_date" in df.columns:
         df["purchase_date_dt"] = pd.to_datetime(
-            df["purchase_date"], errors="coerce"
+            df["purchase_date"], format="ISO8601", errors="coerce"
         )
 
+    df = categorize_labels(df)
+
+    return _to_arrow_strings(
+        df,
+        ("invoice_number", "purchase_date", "purchase_time", "original_currency"),
+    )
+
+
+def categorize_labels(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store low-cardinality label columns as categoricals.
+    """
+    # Filters, unique() and groupby on categories work on integer codes.
+    category_cols = {
+        col: "category"
+        for col in ("vendor_name", "payment_method", "currency")
+        if col in df.columns
+    }
+    if category_cols:
+        df = df.astype(category_cols)
+    return df
+
+
+def _to_arrow_strings(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """
+    Store free-text columns as Arrow-backed strings instead of Python objects.
+    """
+    # pyarrow is installed with Streamlit; contiguous UTF-8 buffers use less
+    # memory and route unique/isin/groupby through Arrow compute kernels.
+    string_cols = {col: "string[pyarrow]" for col in columns if col in df.columns}
+    if string_cols:
+        df = df.astype(string_cols)
     return df
 
 
@@ -43,13 +77,18 @@ def calculate_kpis(df: pd.DataFrame) -> dict:
     if df.empty:
         return {}
 
-    total_spent = df["total_amount"].sum()
-    transactions = len(df)
+    # Work on the raw NumPy arrays: one pass per column, no Series wrappers.
+    # prepare_bills_dataframe already filled missing amounts with 0.
+    amounts = df["total_amount"].to_numpy()
+    total_spent = float(amounts.sum())
+    transactions = len(amounts)
     avg_transaction = total_spent / transactions if transactions else 0
-    vendors_count = df["vendor_name"].nunique()
+    vendors_count = int(df["vendor_name"].nunique())
 
+    # Truncate to calendar months in datetime64 and count distinct, skipping NaT.
     # Fall back to 1 month to avoid divide-by-zero when dates are missing.
-    months_active = df["purchase_date_dt"].dt.to_period("M").nunique() or 1
+    months = df["purchase_date_dt"].to_numpy().astype("datetime64[M]")
+    months_active = len(np.unique(months[~np.isnat(months)])) or 1
     avg_per_month = total_spent / months_active
 
     return {
@@ -82,40 +121,22 @@ def monthly_spending(df: pd.DataFrame) -> pd.DataFrame:
     return monthly
 
 
-def monthly_transaction_counts(df: pd.DataFrame) -> pd.DataFrame:
+def monthly_breakdown(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Count number of bills per month.
+    Monthly bill counts with subtotal and tax breakdown from one groupby.
     """
     if df.empty:
         return pd.DataFrame()
 
-    monthly_counts = (
-        df.dropna(subset=["purchase_date_dt"])
-        .groupby(df["purchase_date_dt"].dt.to_period("M"))
-        .size()
-        .reset_index(name="transactions")
-    )
-
-    # Keep a formatted month label for chart axes.
-    monthly_counts["month"] = monthly_counts["purchase_date_dt"].dt.strftime("%Y-%m")
-    return monthly_counts
-
-
-def monthly_tax_breakdown(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Monthly subtotal and tax breakdown.
-    """
-    if df.empty:
-        return pd.DataFrame()
-
-    # Aggregate by calendar month using the parsed datetime column.
+    # One pass over the bills feeds both the count and the tax charts.
     monthly = (
         df.dropna(subset=["purchase_date_dt"])
         .groupby(df["purchase_date_dt"].dt.to_period("M"))
-        .agg({
-            "total_amount": "sum",
-            "tax_amount": "sum"
-        })
+        .agg(
+            total_amount=("total_amount", "sum"),
+            tax_amount=("tax_amount", "sum"),
+            transactions=("total_amount", "size"),
+        )
         .reset_index()
     )
 
@@ -129,6 +150,26 @@ def monthly_tax_breakdown(df: pd.DataFrame) -> pd.DataFrame:
     return monthly
 
 
+def monthly_transaction_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count number of bills per month.
+    """
+    monthly = monthly_breakdown(df)
+    if monthly.empty:
+        return monthly
+    return monthly[["purchase_date_dt", "transactions", "month"]]
+
+
+def monthly_tax_breakdown(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Monthly subtotal and tax breakdown.
+    """
+    monthly = monthly_breakdown(df)
+    if monthly.empty:
+        return monthly
+    return monthly.drop(columns="transactions")
+
+
 # VENDOR ANALYTICS
 def top_vendors(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     """
@@ -138,7 +179,7 @@ def top_vendors(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
         return pd.DataFrame()
 
     vendor_df = (
-        df.groupby("vendor_name")
+        df.groupby("vendor_name", observed=True)
         .agg({
             "total_amount": ["sum", "count", "mean"]
         })
@@ -169,7 +210,7 @@ def payment_distribution(df: pd.DataFrame) -> pd.DataFrame:
 
     return (
         df[df["payment_method"].notna()]
-        .groupby("payment_method")["total_amount"]
+        .groupby("payment_method", observed=True)["total_amount"]
         .sum()
         .reset_index()
     )
@@ -204,7 +245,7 @@ def prepare_items_dataframe(items: list) -> pd.DataFrame:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
-    return df
+    return _to_arrow_strings(df, ("item_name", "vendor_name", "purchase_date"))
 
 
 def top_items_by_spend(items_df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
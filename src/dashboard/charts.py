@@ -7,6 +7,7 @@ All charts use a consistent theme, interactive tooltips, and responsive layouts.
 """
 
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 
 # THEME & COLOR PALETTE
@@ -227,42 +228,69 @@ def tax_vs_subtotal_bar(monthly_df):
 
 #  VENDOR ANALYSIS
 
-def vendor_pie_chart(vendor_df):
-    """Donut chart for vendor spend distribution with custom hover."""
-    total = vendor_df["total_spent"].sum()
-    vendor_df = vendor_df.copy()
-    vendor_df["pct"] = (vendor_df["total_spent"] / total * 100).round(1)
-
-    fig = go.Figure(
-        data=[
-            go.Pie(
-                labels=vendor_df["vendor_name"],
-                values=vendor_df["total_spent"],
-                hole=0.45,
-                marker=dict(
-                    colors=PALETTE_SEQUENCE[: len(vendor_df)],
-                    line=dict(color="white", width=2.5),
-                ),
-                textinfo="label+percent",
-                textposition="outside",
-                textfont=dict(size=11),
-                hovertemplate=(
-                    "<b>%{label}</b><br>"
-                    "Spent: $%{value:,.2f}<br>"
-                    "Share: %{percent}<extra></extra>"
-                ),
-                pull=[0.03] * len(vendor_df),
-            )
-        ]
-    )
-
+def _vendor_pie_trace(vendor_df):
+    """Donut trace for vendor spend share."""
+    return go.Pie(
+        labels=vendor_df["vendor_name"],
+        values=vendor_df["total_spent"],
+        hole=0.45,
+        marker=dict(
+            colors=PALETTE_SEQUENCE[: len(vendor_df)],
+            line=dict(color="white", width=2.5),
+        ),
+        textinfo="label+percent",
+        textposition="outside",
+        textfont=dict(size=11),
+        hovertemplate=(
+            "<b>%{label}</b><br>"
+            "Spent: $%{value:,.2f}<br>"
+            "Share: %{percent}<extra></extra>"
+        ),
+        pull=[0.03] * len(vendor_df),
+    )
+
+
+def _vendor_bar_trace(vendor_df):
+    """Horizontal bar trace ranking the top 10 vendors by spend."""
+    df = vendor_df.sort_values("total_spent", ascending=True).tail(10)
+    return go.Bar(
+        y=df["vendor_name"],
+        x=df["total_spent"],
+        orientation="h",
+        marker=dict(
+            color=df["total_spent"],
+            colorscale=[[0, "#c7d2fe"], [1, COLORS["primary"]]],
+            line=dict(color="white", width=1),
+        ),
+        text=[f"${v:,.0f}" for v in df["total_spent"]],
+        textposition="outside",
+        textfont=dict(size=11),
+        cliponaxis=False,
+        hovertemplate="<b>%{y}</b><br>Total: $%{x:,.2f}<extra></extra>",
+    )
+
+
+def _donut_total_annotation(fig, total, font_size, row=None, col=None):
+    """Write the grand total in the hole of a donut chart."""
+    x, y = 0.5, 0.5
+    if row is not None:
+        # Center on the pie's subplot domain rather than the whole figure.
+        domain = fig.get_subplot(row, col)
+        x, y = sum(domain.x) / 2, sum(domain.y) / 2
     fig.add_annotation(
         text=f"<b>${total:,.0f}</b><br><span style='font-size:11px'>Total</span>",
-        x=0.5, y=0.5,
-        font=dict(size=16, color=COLORS["dark"]),
+        x=x, y=y,
+        xref="paper", yref="paper",
+        font=dict(size=font_size, color=COLORS["dark"]),
         showarrow=False,
     )
 
+
+def vendor_pie_chart(vendor_df):
+    """Donut chart for vendor spend distribution with custom hover."""
+    fig = go.Figure(data=[_vendor_pie_trace(vendor_df)])
+    _donut_total_annotation(fig, vendor_df["total_spent"].sum(), 16)
+
     _apply_theme(
         fig,
         title=dict(text="Top Vendors by Spend"),
@@ -274,26 +302,8 @@ def vendor_pie_chart(vendor_df):
 
 def vendor_bar_chart(vendor_df):
     """Horizontal bar chart ranking vendors by total spend."""
-    df = vendor_df.sort_values("total_spent", ascending=True).tail(10)
-
     fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            y=df["vendor_name"],
-            x=df["total_spent"],
-            orientation="h",
-            marker=dict(
-                color=df["total_spent"],
-                colorscale=[[0, "#c7d2fe"], [1, COLORS["primary"]]],
-                line=dict(color="white", width=1),
-            ),
-            text=[f"${v:,.0f}" for v in df["total_spent"]],
-            textposition="outside",
-            textfont=dict(size=11),
-            cliponaxis=False,
-            hovertemplate="<b>%{y}</b><br>Total: $%{x:,.2f}<extra></extra>",
-        )
-    )
+    fig.add_trace(_vendor_bar_trace(vendor_df))
 
     _apply_theme(
         fig,
@@ -304,41 +314,81 @@ def vendor_bar_chart(vendor_df):
     )
     return fig
 
-#  PAYMENT METHOD ANALYSIS
 
-def payment_method_pie(payment_df):
-    """Donut chart for payment method distribution."""
-    total = payment_df["total_amount"].sum()
-
-    fig = go.Figure(
-        data=[
-            go.Pie(
-                labels=payment_df["payment_method"],
-                values=payment_df["total_amount"],
-                hole=0.5,
-                marker=dict(
-                    colors=[COLORS["primary"], COLORS["success"], COLORS["orange"],
-                            COLORS["purple"], COLORS["teal"], COLORS["danger"]],
-                    line=dict(color="white", width=2.5),
-                ),
-                textinfo="label+percent",
-                textposition="outside",
-                textfont=dict(size=11),
-                hovertemplate=(
-                    "<b>%{label}</b><br>"
-                    "Amount: $%{value:,.2f}<br>"
-                    "Share: %{percent}<extra></extra>"
-                ),
-            )
-        ]
+def vendor_combined(vendor_df):
+    """Vendor ranking bar and spend-share donut side by side in one figure."""
+    fig = make_subplots(
+        rows=1,
+        cols=2,
+        specs=[[{"type": "xy"}, {"type": "domain"}]],
+        subplot_titles=("Vendor Spend Ranking", "Top Vendors by Spend"),
+        horizontal_spacing=0.12,
     )
+    fig.add_trace(_vendor_bar_trace(vendor_df), row=1, col=1)
+    fig.add_trace(_vendor_pie_trace(vendor_df), row=1, col=2)
+    _donut_total_annotation(fig, vendor_df["total_spent"].sum(), 16, row=1, col=2)
 
-    fig.add_annotation(
-        text=f"<b>${total:,.0f}</b><br><span style='font-size:11px'>Total</span>",
-        x=0.5, y=0.5,
-        font=dict(size=15, color=COLORS["dark"]),
-        showarrow=False,
+    _apply_theme(
+        fig,
+        title=dict(text="Vendor Spending"),
+        height=420,
+        showlegend=False,
     )
+    fig.update_xaxes(title_text="Total Spend ($)", row=1, col=1)
+    return fig
+
+#  PAYMENT METHOD ANALYSIS
+
+_PAYMENT_COLORS = [
+    COLORS["primary"], COLORS["success"], COLORS["orange"],
+    COLORS["purple"], COLORS["teal"], COLORS["danger"],
+]
+
+
+def _payment_pie_trace(payment_df):
+    """Donut trace for payment method share."""
+    return go.Pie(
+        labels=payment_df["payment_method"],
+        values=payment_df["total_amount"],
+        hole=0.5,
+        marker=dict(
+            colors=_PAYMENT_COLORS,
+            line=dict(color="white", width=2.5),
+        ),
+        textinfo="label+percent",
+        textposition="outside",
+        textfont=dict(size=11),
+        hovertemplate=(
+            "<b>%{label}</b><br>"
+            "Amount: $%{value:,.2f}<br>"
+            "Share: %{percent}<extra></extra>"
+        ),
+    )
+
+
+def _payment_bar_trace(payment_df):
+    """Horizontal bar trace comparing payment methods."""
+    df = payment_df.sort_values("total_amount", ascending=True)
+    return go.Bar(
+        y=df["payment_method"],
+        x=df["total_amount"],
+        orientation="h",
+        marker=dict(
+            color=_PAYMENT_COLORS[: len(df)],
+            line=dict(color="white", width=1),
+        ),
+        text=[f"${v:,.0f}" for v in df["total_amount"]],
+        textposition="outside",
+        textfont=dict(size=11),
+        cliponaxis=False,
+        hovertemplate="<b>%{y}</b><br>Total: $%{x:,.2f}<extra></extra>",
+    )
+
+
+def payment_method_pie(payment_df):
+    """Donut chart for payment method distribution."""
+    fig = go.Figure(data=[_payment_pie_trace(payment_df)])
+    _donut_total_annotation(fig, payment_df["total_amount"].sum(), 15)
 
     _apply_theme(
         fig,
@@ -351,26 +401,8 @@ def payment_method_pie(payment_df):
 
 def payment_method_bar(payment_df):
     """Bar chart comparing payment methods side by side."""
-    df = payment_df.sort_values("total_amount", ascending=True)
-
     fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            y=df["payment_method"],
-            x=df["total_amount"],
-            orientation="h",
-            marker=dict(
-                color=[COLORS["primary"], COLORS["success"], COLORS["orange"],
-                       COLORS["purple"], COLORS["teal"], COLORS["danger"]][: len(df)],
-                line=dict(color="white", width=1),
-            ),
-            text=[f"${v:,.0f}" for v in df["total_amount"]],
-            textposition="outside",
-            textfont=dict(size=11),
-            cliponaxis=False,
-            hovertemplate="<b>%{y}</b><br>Total: $%{x:,.2f}<extra></extra>",
-        )
-    )
+    fig.add_trace(_payment_bar_trace(payment_df))
 
     _apply_theme(
         fig,
@@ -382,6 +414,29 @@ def payment_method_bar(payment_df):
     return fig
 
 
+def payment_combined(payment_df):
+    """Payment method bar and share donut side by side in one figure."""
+    fig = make_subplots(
+        rows=1,
+        cols=2,
+        specs=[[{"type": "xy"}, {"type": "domain"}]],
+        subplot_titles=("Spending by Payment Method", "Payment Method Distribution"),
+        horizontal_spacing=0.12,
+    )
+    fig.add_trace(_payment_bar_trace(payment_df), row=1, col=1)
+    fig.add_trace(_payment_pie_trace(payment_df), row=1, col=2)
+    _donut_total_annotation(fig, payment_df["total_amount"].sum(), 15, row=1, col=2)
+
+    _apply_theme(
+        fig,
+        title=dict(text="Payment Methods"),
+        height=400,
+        showlegend=False,
+    )
+    fig.update_xaxes(title_text="Amount ($)", row=1, col=1)
+    return fig
+
+
 #  TRANSACTION DISTRIBUTION
 
 def transaction_histogram(df):
@@ -435,11 +490,10 @@ def day_of_week_bar(df):
     if "purchase_date_dt" not in df.columns:
         return go.Figure()
 
-    df = df.copy()
-    df["day_name"] = df["purchase_date_dt"].dt.day_name()
     day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    # Group on the derived Series directly instead of copying the frame to add a column.
     day_data = (
-        df.groupby("day_name")["total_amount"]
+        df.groupby(df["purchase_date_dt"].dt.day_name())["total_amount"]
         .agg(["sum", "count"])
         .reindex(day_order)
         .fillna(0)
@@ -555,16 +609,19 @@ def yoy_comparison(df):
     if "purchase_date_dt" not in df.columns:
         return go.Figure()
 
-    df = df.copy()
-    df["year"] = df["purchase_date_dt"].dt.year
-    df["month_num"] = df["purchase_date_dt"].dt.month
-    df["month_name"] = df["purchase_date_dt"].dt.strftime("%b")
+    # Group on derived Series directly instead of copying the frame to add columns.
+    dates = df["purchase_date_dt"].dt
+    keys = [
+        dates.year.rename("year"),
+        dates.month.rename("month_num"),
+        dates.strftime("%b").rename("month_name"),
+    ]
 
+    # groupby already returns rows ordered by year, then month.
     yearly = (
-        df.groupby(["year", "month_num", "month_name"])["total_amount"]
+        df.groupby(keys)["total_amount"]
         .sum()
         .reset_index()
-        .sort_values(["year", "month_num"])
     )
 
     years = sorted(yearly["year"].unique())
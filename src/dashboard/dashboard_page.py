@@ -12,116 +12,227 @@ Data flow overview:
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from io import StringIO
 import re
 
-from src.database import get_all_bills, get_bill_items
+from src.database import get_all_bills_df, get_items_for_bills
 from src.dashboard import analytics as dashboard_analytics
 from src.dashboard import charts as dashboard_charts
 from src.dashboard import insights as dashboard_insights
 from src.dashboard import ai_insights as dashboard_ai_insights
 
-from src.database import get_monthly_spending
-from src.database import get_filtered_bills
+from src.database import get_monthly_spending, get_month_kpi_window
+from src.database import get_distinct_vendors, get_distinct_payment_methods
+from src.database import get_filtered_bills_df
 
 
-import time
+# Inline markdown rules for AI insight rendering, compiled once at import.
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_EM_RE = re.compile(r"\*(.+?)\*")
+
+# Date presets mapped to (start, end) builders, created once at import so a
+# rerun only evaluates the selected preset. Anything else spans all data.
+_DATE_PRESETS = {
+    "Last 7 Days": lambda now: (now - timedelta(days=7), now),
+    "Last 30 Days": lambda now: (now - timedelta(days=30), now),
+    "Last 3 Months": lambda now: (now - timedelta(days=90), now),
+    "Last 6 Months": lambda now: (now - timedelta(days=180), now),
+    "This Year": lambda now: (now.replace(month=1, day=1), now),
+}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_items(bill_ids: tuple):
+    """Fetch line items for the given bills, enriched with bill metadata.
+
+    Vendor and date come from the SQL JOIN in get_items_for_bills, so no
+    per-item dict merge happens in Python.
+
+    Args:
+        bill_ids: Sorted tuple of bill ids; a cheap, hashable cache key.
+
+    Returns:
+        List of line item dictionaries including bill metadata.
+    """
+    try:
+        return get_items_for_bills(list(bill_ids))
+    except Exception:
+        return []
 
 
 @st.cache_data(ttl=60, show_spinner=False)
-def _cached_bills():
-    """Fetch all bills from the database with a short-lived cache.
+def _cached_bills_dataframe():
+    """Build the prepared bills DataFrame once per cache window.
+
+    Reruns triggered by widgets reuse the parsed dates and categoricals,
+    and the frame is read straight from the cursor without a list of dicts.
 
     Returns:
-        List of bill dictionaries, or an empty list on failure.
+        Prepared bills DataFrame (empty when no bills are available or on failure).
     """
     try:
-        return get_all_bills() or []
+        bills_df = get_all_bills_df()
     except Exception as exc:
         st.warning(f"Could not load bills: {exc}")
-        return []
+        return pd.DataFrame()
+    return dashboard_analytics.prepare_bills_dataframe(bills_df)
 
 
 @st.cache_data(ttl=60, show_spinner=False)
-def _cached_items(bills):
-    """Fetch line items for each bill and enrich with bill metadata.
+def _cached_kpis():
+    """Compute the headline KPIs for all bills once per cache window.
+
+    Returns:
+        KPI dictionary from calculate_kpis (empty when no bills are available).
+    """
+    return dashboard_analytics.calculate_kpis(_cached_bills_dataframe())
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_items_dataframe(bill_ids: tuple):
+    """Build the prepared line items DataFrame for the given bills.
 
     Args:
-        bills: List of bill dictionaries with id and metadata fields.
+        bill_ids: Sorted tuple of bill ids; a cheap, hashable cache key.
 
     Returns:
-        List of line item dictionaries including bill metadata.
+        Prepared line items DataFrame.
     """
-    items = []
-    for bill in bills:
-        try:
-            bill_items = get_bill_items(bill.get("id"))
-        except Exception:
-            bill_items = []
-        for item in bill_items:
-            items.append(
-                {
-                    **item,
-                    "bill_id": bill.get("id"),
-                    "vendor_name": bill.get("vendor_name"),
-                    "purchase_date": bill.get("purchase_date"),
-                }
-            )
-    return items
+    return dashboard_analytics.prepare_items_dataframe(_cached_items(bill_ids))
 
 
-def _render_ai_insights(markdown_text: str) -> None:
-    """Render AI insights with enhanced styling using simple markdown-to-HTML rules."""
-    if not markdown_text:
-        return
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_ai_summary(bill_ids: tuple, _filtered_df, _vendor_df, _payment_df, _items_df):
+    """Build the AI summary and its hash once per filtered bill set.
 
-    html_lines = []
-    in_list = False
+    The frames are all derived from the filtered bills, so the underscore
+    arguments are left out of the cache key and only bill_ids is hashed.
 
-    def close_list():
-        nonlocal in_list
-        if in_list:
-            html_lines.append("</ul>")
-            in_list = False
+    Args:
+        bill_ids: Sorted tuple of filtered bill ids; a cheap, hashable cache key.
+        _filtered_df: Filtered bills DataFrame.
+        _vendor_df: Vendor aggregates for the filtered bills.
+        _payment_df: Payment method aggregates for the filtered bills.
+        _items_df: Line items for the filtered bills.
 
-    def format_inline(text: str) -> str:
-        text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
-        text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
-        return text
+    Returns:
+        Tuple of (summary dictionary, summary hash).
+    """
+    summary = dashboard_ai_insights.build_summary(
+        _filtered_df,
+        _vendor_df,
+        _payment_df,
+        _items_df,
+    )
+    return summary, dashboard_ai_insights.summary_hash(summary)
 
-    for raw_line in markdown_text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            close_list()
-            html_lines.append("<div class='ai-gap'></div>")
-            continue
 
-        if line.startswith("## "):
-            close_list()
-            title = format_inline(line[3:])
-            html_lines.append(f"<h2 class='ai-section-title'>{title}</h2>")
-            continue
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_bill_insights(bill_ids: tuple, _filtered_df):
+    """Compute the insights drawn straight from the filtered bills once per bill set.
 
-        if line == "---":
-            close_list()
-            html_lines.append("<hr class='ai-divider' />")
-            continue
+    The year, day-of-week and histogram insights scan every filtered bill;
+    keying on bill_ids makes reruns with unchanged filters a cache hit.
 
-        if line.startswith("-"):
-            if not in_list:
-                html_lines.append("<ul class='ai-list'>")
-                in_list = True
-            item = format_inline(line[1:].strip())
-            html_lines.append(f"<li>{item}</li>")
-            continue
+    Args:
+        bill_ids: Sorted tuple of filtered bill ids; a cheap, hashable cache key.
+        _filtered_df: Filtered bills DataFrame (excluded from hashing).
 
-        close_list()
-        html_lines.append(f"<p class='ai-paragraph'>{format_inline(line)}</p>")
+    Returns:
+        Dictionary of insight sentences (or None) keyed by chart.
+    """
+    return {
+        "yoy": dashboard_insights.yoy_insight(_filtered_df),
+        "histogram": dashboard_insights.transaction_histogram_insight(_filtered_df),
+        "day_of_week": dashboard_insights.day_of_week_insight(_filtered_df),
+    }
 
-    close_list()
 
-    html = "\n".join(html_lines)
-    st.markdown(
-        """
+@st.cache_data(ttl=60, show_spinner=False)
+def _vendor_options():
+    """Return the vendor filter options, read from SQL with a short-lived cache."""
+    return ["All Vendors"] + get_distinct_vendors()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _payment_options():
+    """Return the payment method filter options, read from SQL with a short-lived cache."""
+    return ["All Methods"] + get_distinct_payment_methods()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _filter_bounds():
+    """Return the date and amount bounds for the filter widgets.
+
+    Returns:
+        Dictionary with date_min/date_max timestamps and amount_min/amount_max floats.
+    """
+    bills_df = _cached_bills_dataframe()
+    return {
+        "date_min": bills_df["purchase_date_dt"].min(),
+        "date_max": bills_df["purchase_date_dt"].max(),
+        "amount_min": float(bills_df["total_amount"].min()),
+        "amount_max": float(bills_df["total_amount"].max()),
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_monthly_spending(**filters):
+    """Fetch SQL-aggregated monthly spending totals with a short-lived cache.
+
+    Args:
+        **filters: Filter keyword arguments forwarded to get_monthly_spending.
+
+    Returns:
+        List of {"month", "total_amount"} dictionaries, or an empty list on failure.
+    """
+    try:
+        return get_monthly_spending(**filters) or []
+    except Exception as exc:
+        st.warning(f"Could not load monthly spending: {exc}")
+        return []
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_filtered_bills(**filters):
+    """Fetch the SQL-filtered bills as a DataFrame with parsed dates.
+
+    Widget reruns that leave the filters unchanged reuse the query result,
+    the parsed purchase_date_dt column and the categorical label columns.
+
+    Args:
+        **filters: Filter keyword arguments forwarded to get_filtered_bills_df.
+
+    Returns:
+        Filtered bills DataFrame (empty when nothing matches).
+    """
+    # read_sql keeps the columns on an empty result, so the summary and
+    # empty-state checks downstream never hit a column-less frame.
+    filtered_df = get_filtered_bills_df(**filters)
+    filtered_df["purchase_date_dt"] = pd.to_datetime(
+        filtered_df["purchase_date"], format="ISO8601", errors="coerce"
+    )
+    # Vendor/payment groupbys downstream run on category codes.
+    return dashboard_analytics.categorize_labels(filtered_df)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_month_kpis(current_month_start: str, prev_month_start: str):
+    """Fetch current/previous month KPI aggregates with a short-lived cache.
+
+    Args:
+        current_month_start: First day of the current month (YYYY-MM-DD).
+        prev_month_start: First day of the previous month (YYYY-MM-DD).
+
+    Returns:
+        Dictionary with "current" and "previous" KPI rows.
+    """
+    return get_month_kpi_window(current_month_start, prev_month_start)
+
+
+# Style sheets are built once at import; Streamlit drops elements that are not
+# re-emitted on a rerun, so they are still sent each time the page renders.
+_AI_INSIGHTS_CSS = """
         <style>
         .ai-insights-card {
             background: linear-gradient(180deg, #ffffff 0%, #f6f8fb 100%);
@@ -158,16 +269,9 @@ def _render_ai_insights(markdown_text: str) -> None:
             height: 0.5rem;
         }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
-    st.markdown(f"<div class='ai-insights-card'>{html}</div>", unsafe_allow_html=True)
-
-
-def _inject_dashboard_styles() -> None:
-    """Inject a cohesive visual theme for dashboard sections and cards."""
-    st.markdown(
         """
+
+_DASHBOARD_CSS = """
         <style>
         .stApp {
             background: radial-gradient(circle at top right, #f8fbff 0%, #f4f7fb 40%, #f7f9fc 100%);
@@ -286,16 +390,96 @@ def _inject_dashboard_styles() -> None:
             font-weight: 600;
         }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+@st.cache_data(show_spinner=False)
+def _ai_insights_html(markdown_text: str) -> str:
+    """Convert AI insights markdown to the styled card HTML using simple rules.
+
+    Cached on the narrative text, so reruns that redisplay a stored narrative
+    skip the line-by-line conversion.
+    """
+    buf = StringIO()
+    in_list = False
+
+    def close_list():
+        nonlocal in_list
+        if in_list:
+            buf.write("</ul>\n")
+            in_list = False
+
+    def format_inline(text: str) -> str:
+        return _EM_RE.sub(r"<em>\1</em>", _BOLD_RE.sub(r"<strong>\1</strong>", text))
+
+    for raw_line in markdown_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            close_list()
+            buf.write("<div class='ai-gap'></div>\n")
+            continue
+
+        if line.startswith("## "):
+            close_list()
+            title = format_inline(line[3:])
+            buf.write(f"<h2 class='ai-section-title'>{title}</h2>\n")
+            continue
+
+        if line == "---":
+            close_list()
+            buf.write("<hr class='ai-divider' />\n")
+            continue
+
+        if line.startswith("-"):
+            if not in_list:
+                buf.write("<ul class='ai-list'>\n")
+                in_list = True
+            item = format_inline(line[1:].strip())
+            buf.write(f"<li>{item}</li>\n")
+            continue
+
+        close_list()
+        buf.write(f"<p class='ai-paragraph'>{format_inline(line)}</p>\n")
+
+    close_list()
+
+    # Ship the style sheet and the card in a single markdown element.
+    return f"{_AI_INSIGHTS_CSS}<div class='ai-insights-card'>{buf.getvalue()}</div>"
+
+
+def _render_ai_insights(markdown_text: str) -> None:
+    """Render AI insights with enhanced styling using simple markdown-to-HTML rules."""
+    if not markdown_text:
+        return
+
+    st.markdown(_ai_insights_html(markdown_text), unsafe_allow_html=True)
+
+
+_PAGE_HEADER_HTML = (
+    "<h1 style='color: #2c3e50;'>📊 Financial Dashboard</h1>"
+    "<p style='color: #7f8c8d; font-size: 1.1rem;'>"
+    "Comprehensive insights into your spending patterns</p>"
+)
+
+_NO_DATA_HTML = """
+            <div style='text-align: center; padding: 3rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                        border-radius: 10px; color: white;'>
+                <h2>📭 No Data Available</h2>
+                <p style='font-size: 1.2rem;'>Upload and save your first bill to unlock powerful insights!</p>
+            </div>
+            """
+
+
+def _inject_dashboard_styles() -> None:
+    """Inject a cohesive visual theme for dashboard sections and cards."""
+    st.markdown(_DASHBOARD_CSS, unsafe_allow_html=True)
 
 
 def _render_quick_insights(insights: list[str]) -> None:
     """Render a highlighted quick-insights card."""
     if not insights:
         return
-    bullets = "".join([f"<li>{insight}</li>" for insight in insights[:3]])
+    bullets = "".join(f"<li>{insight}</li>" for insight in insights[:3])
     st.markdown(
         f"""
         <div class='quick-insight-card'>
@@ -307,6 +491,24 @@ def _render_quick_insights(insights: list[str]) -> None:
     )
 
 
+def _chart_key(name: str, source) -> str:
+    """Build a stable widget key for a chart from its source data.
+
+    Streamlit skips re-sending a keyed chart when the key is unchanged, so
+    reruns that do not touch the underlying aggregate avoid the roundtrip.
+
+    Args:
+        name: Chart name prefix.
+        source: Aggregate DataFrame behind the chart, or the sorted tuple of
+            filtered bill ids for charts drawn straight from the bills.
+    """
+    if isinstance(source, tuple):
+        return f"{name}_{hash(source)}"
+    # Vectorized row hashes instead of boxing every row into a Python tuple.
+    row_hashes = pd.util.hash_pandas_object(source, index=False).to_numpy()
+    return f"{name}_{hash(row_hashes.tobytes())}"
+
+
 def _render_insight_note(insight: str) -> None:
     """Render a compact styled insight note under a chart."""
     if not insight:
@@ -317,72 +519,153 @@ def _render_insight_note(insight: str) -> None:
     )
 
 
-def page_dashboard():
-    """Render the main spending dashboard with metrics, filters, and tables.
-
-    Builds the UI layout, computes KPI summaries, applies filters, and shows
-    filtered bill data with guidance when no results are available.
+@st.fragment
+def _render_ai_tab(
+    bill_ids: tuple,
+    filtered_df: pd.DataFrame,
+    vendor_df: pd.DataFrame,
+    payment_df: pd.DataFrame,
+    items_df: pd.DataFrame,
+) -> None:
+    """Render the AI insights tab as a fragment.
 
-    This function is intentionally UI-focused and delegates data logic to
-    src.dashboard.analytics and chart rendering to src.dashboard.charts.
+    Clicking the generate button reruns only this fragment instead of the
+    whole dashboard (queries, KPIs and every chart tab).
     """
-    start = time.time()
-    monthly_data = get_monthly_spending()
-    print("Monthly query time:", time.time() - start)
-
-    _inject_dashboard_styles()
-
-    # Page title and subtitle.
     st.markdown(
-        "<h1 style='color: #2c3e50;'>📊 Financial Dashboard</h1>",
+        """
+        <div class='ai-tab-hero'>
+            <p class='ai-tab-hero-title'>🤖 AI Insights Studio</p>
+            <p class='ai-tab-hero-subtitle'>
+                Turn your filtered bills into concise, actionable insights using Gemini.
+                Generate a narrative summary of trends, vendor behavior, and payment patterns.
+            </p>
+        </div>
+        """,
         unsafe_allow_html=True,
     )
+
+    ai_metric_col1, ai_metric_col2, ai_metric_col3 = st.columns(3)
+    with ai_metric_col1:
+        st.metric("📌 Records in Scope", f"{len(filtered_df):,}")
+    with ai_metric_col2:
+        st.metric("💳 Payment Methods", f"{payment_df['payment_method'].nunique() if not payment_df.empty else 0}")
+    with ai_metric_col3:
+        st.metric("🏪 Vendors in Scope", f"{vendor_df['vendor_name'].nunique() if not vendor_df.empty else 0}")
+
     st.markdown(
-        "<p style='color: #7f8c8d; font-size: 1.1rem;'>"
-        "Comprehensive insights into your spending patterns</p>",
+        """
+        <div class='ai-action-card'>
+            <p class='ai-action-title'>✨ Generate Insight Narrative</p>
+            <p class='ai-action-subtitle'>Create a polished explanation of spending trends for the currently selected filters.</p>
+        </div>
+        """,
         unsafe_allow_html=True,
     )
-    st.divider()
 
-    # Load cached bills data.
-    bills = _cached_bills()
-    if not bills:
+    if not st.session_state.get("api_key"):
         st.markdown(
             """
-            <div style='text-align: center; padding: 3rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        border-radius: 10px; color: white;'>
-                <h2>📭 No Data Available</h2>
-                <p style='font-size: 1.2rem;'>Upload and save your first bill to unlock powerful insights!</p>
+            <div class='ai-info-card'>
+                Add your Gemini API key in the sidebar to unlock AI-generated insights.
             </div>
             """,
             unsafe_allow_html=True,
         )
-        return
+    else:
+        generate_clicked = st.button(
+            "✨ Generate AI Insights",
+            key="ai_insights_generate",
+            type="primary",
+            use_container_width=True,
+        )
+
+        # st.tabs runs every tab body on each rerun, so skip the summary
+        # roll-ups unless a generate click or a stored narrative needs them.
+        if not generate_clicked and not st.session_state.get("ai_insights_text"):
+            return
+
+        summary, summary_key = _cached_ai_summary(
+            bill_ids,
+            filtered_df,
+            vendor_df,
+            payment_df,
+            items_df,
+        )
+
+        if generate_clicked:
+            with st.spinner("Generating insights with Gemini..."):
+                result = dashboard_ai_insights.generate_ai_insights(
+                    summary,
+                    st.session_state.get("api_key"),
+                )
+            if result.get("error"):
+                st.error(result["error"])
+            else:
+                st.session_state["ai_insights_text"] = result.get("text", "")
+                st.session_state["ai_insights_key"] = summary_key
+
+        cached_text = st.session_state.get("ai_insights_text")
+        cached_key = st.session_state.get("ai_insights_key")
+
+        if cached_text and cached_key == summary_key:
+            _render_ai_insights(cached_text)
+        elif cached_text and cached_key != summary_key:
+            st.markdown(
+                """
+                <div class='ai-refresh-hint'>
+                    Filters changed since the last run. Click <strong>Generate AI Insights</strong> to refresh.
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+
+
+def page_dashboard():
+    """Render the main spending dashboard with metrics, filters, and tables.
+
+    Builds the UI layout, computes KPI summaries, applies filters, and shows
+    filtered bill data with guidance when no results are available.
+
+    This function is intentionally UI-focused and delegates data logic to
+    src.dashboard.analytics and chart rendering to src.dashboard.charts.
+    """
+    _inject_dashboard_styles()
+
+    # Page title and subtitle.
+    st.markdown(_PAGE_HEADER_HTML, unsafe_allow_html=True)
+    st.divider()
 
-    # Normalize bills to a DataFrame and parse dates for time-based analysis.
-    bills_df = dashboard_analytics.prepare_bills_dataframe(bills)
+    # Load the cached bills frame with parsed dates for time-based analysis.
+    bills_df = _cached_bills_dataframe()
+    if bills_df.empty:
+        st.markdown(_NO_DATA_HTML, unsafe_allow_html=True)
+        return
 
     # Aggregate headline metrics used by KPI cards.
-    kpis = dashboard_analytics.calculate_kpis(bills_df)
+    kpis = _cached_kpis()
     total_spent = kpis.get("total_spent", 0)
     transactions_count = kpis.get("transactions", 0)
     avg_transaction = kpis.get("avg_transaction", 0)
     vendors_count = kpis.get("vendors_count", 0)
     avg_per_month = kpis.get("avg_per_month", 0)
 
+    # Single clock read shared by the month windows and the date presets.
+    now = datetime.now()
+
     # Compute current and previous month windows.
-    current_month = datetime.now().replace(day=1)
+    current_month = now.replace(day=1)
     prev_month = (current_month - timedelta(days=1)).replace(day=1)
 
-    # Split the dataset into current and previous month windows for deltas.
-    current_month_data = bills_df[bills_df["purchase_date_dt"] >= current_month]
-    prev_month_data = bills_df[
-        (bills_df["purchase_date_dt"] >= prev_month)
-        & (bills_df["purchase_date_dt"] < current_month)
-    ]
+    # Current and previous month roll-ups are aggregated in SQL.
+    month_kpis = _cached_month_kpis(
+        current_month.strftime("%Y-%m-%d"), prev_month.strftime("%Y-%m-%d")
+    )
+    current_stats = month_kpis["current"]
+    prev_stats = month_kpis["previous"]
 
-    current_month_spend = current_month_data["total_amount"].sum()
-    prev_month_spend = prev_month_data["total_amount"].sum()
+    current_month_spend = current_stats["spend"]
+    prev_month_spend = prev_stats["spend"]
 
     spend_delta = current_month_spend - prev_month_spend
     spend_delta_pct = (
@@ -390,36 +673,24 @@ def page_dashboard():
     )
 
     # KPI cards for quick insights, with deltas vs previous month.
-    current_month_bills = len(current_month_data)
-    prev_month_bills = len(prev_month_data)
-    current_avg_bill = (
-        current_month_data["total_amount"].mean() if current_month_bills else 0
-    )
-    prev_avg_bill = (
-        prev_month_data["total_amount"].mean() if prev_month_bills else 0
-    )
-    current_vendor_count = current_month_data["vendor_name"].nunique()
-    prev_vendor_count = prev_month_data["vendor_name"].nunique()
-
-    current_month_median = (
-        current_month_data["total_amount"].median() if current_month_bills else 0
-    )
-    prev_month_median = (
-        prev_month_data["total_amount"].median() if prev_month_bills else 0
-    )
-    current_month_max = (
-        current_month_data["total_amount"].max() if current_month_bills else 0
-    )
-    prev_month_max = (
-        prev_month_data["total_amount"].max() if prev_month_bills else 0
-    )
+    current_month_bills = current_stats["bills"]
+    prev_month_bills = prev_stats["bills"]
+    current_avg_bill = current_stats["avg_bill"]
+    prev_avg_bill = prev_stats["avg_bill"]
+    current_vendor_count = current_stats["vendors"]
+    prev_vendor_count = prev_stats["vendors"]
+
+    current_month_median = current_stats["median_bill"]
+    prev_month_median = prev_stats["median_bill"]
+    current_month_max = current_stats["max_bill"]
+    prev_month_max = prev_stats["max_bill"]
     current_month_tax_rate = (
-        (current_month_data["tax_amount"].sum() / current_month_spend * 100)
+        (current_stats["tax_amount"] / current_month_spend * 100)
         if current_month_spend > 0
         else 0
     )
     prev_month_tax_rate = (
-        (prev_month_data["tax_amount"].sum() / prev_month_spend * 100)
+        (prev_stats["tax_amount"] / prev_month_spend * 100)
         if prev_month_spend > 0
         else 0
     )
@@ -435,9 +706,7 @@ def page_dashboard():
         (avg_bill_delta / prev_avg_bill * 100) if prev_avg_bill > 0 else None
     )
     st.markdown("<div class='dashboard-section-title'>📈 Key Metrics</div>", unsafe_allow_html=True)
-    template_parsing_count = sum(
-        1 for bill in bills if bill.get("parsed_with_template")
-    )
+    template_parsing_count = int(bills_df["parsed_with_template"].sum())
     row1_col1, row1_col2, row1_col3 = st.columns(3)
     with row1_col1:
         st.metric(
@@ -501,40 +770,17 @@ def page_dashboard():
     with preset_col:
         date_preset = st.selectbox(
             "Quick Select",
-            [
-                "Custom Range",
-                "Last 7 Days",
-                "Last 30 Days",
-                "Last 3 Months",
-                "Last 6 Months",
-                "This Year",
-                "All Time",
-            ],
+            ["Custom Range", *_DATE_PRESETS, "All Time"],
             key="date_preset",
         )
 
-    # Translate date presets into concrete ranges.
-    if date_preset == "Last 7 Days":
-        start_date = datetime.now() - timedelta(days=7)
-        end_date = datetime.now()
-    elif date_preset == "Last 30 Days":
-        start_date = datetime.now() - timedelta(days=30)
-        end_date = datetime.now()
-    elif date_preset == "Last 3 Months":
-        start_date = datetime.now() - timedelta(days=90)
-        end_date = datetime.now()
-    elif date_preset == "Last 6 Months":
-        start_date = datetime.now() - timedelta(days=180)
-        end_date = datetime.now()
-    elif date_preset == "This Year":
-        start_date = datetime.now().replace(month=1, day=1)
-        end_date = datetime.now()
-    elif date_preset == "All Time":
-        start_date = bills_df["purchase_date_dt"].min()
-        end_date = bills_df["purchase_date_dt"].max()
+    # Translate date presets into concrete ranges; anything else spans all data.
+    bounds = _filter_bounds()
+    preset_range = _DATE_PRESETS.get(date_preset)
+    if preset_range is not None:
+        start_date, end_date = preset_range(now)
     else:
-        start_date = bills_df["purchase_date_dt"].min()
-        end_date = bills_df["purchase_date_dt"].max()
+        start_date, end_date = bounds["date_min"], bounds["date_max"]
 
     # Filter widgets laid out in four columns.
     filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
@@ -543,43 +789,31 @@ def page_dashboard():
         if date_preset == "Custom Range":
             date_range = st.date_input(
                 "📅 Date Range",
-                value=(
-                    bills_df["purchase_date_dt"].min().date(),
-                    bills_df["purchase_date_dt"].max().date(),
-                ),
+                value=(bounds["date_min"].date(), bounds["date_max"].date()),
                 key="date_range_filter",
             )
             if len(date_range) == 2:
-                start_date, end_date = date_range
-                start_date = pd.to_datetime(start_date)
-                end_date = pd.to_datetime(end_date)
+                start_date, end_date = pd.to_datetime(list(date_range))
         else:
             st.markdown("**📅 Date Range**")
             st.caption(f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
 
     with filter_col2:
-        all_vendors = ["All Vendors"] + sorted(
-            bills_df["vendor_name"].dropna().unique().tolist()
-        )
+        all_vendors = _vendor_options()
         selected_vendor = st.selectbox("🏪 Vendor", options=all_vendors, key="vendor_filter")
 
     with filter_col3:
-        min_amount = bills_df["total_amount"].min()
-        max_amount = bills_df["total_amount"].max()
         amount_range = st.slider(
             "💵 Amount Range ($)",
-            min_value=float(min_amount),
-            max_value=float(max_amount),
-            value=(float(min_amount), float(max_amount)),
+            min_value=bounds["amount_min"],
+            max_value=bounds["amount_max"],
+            value=(bounds["amount_min"], bounds["amount_max"]),
             step=10.0,
             key="amount_filter",
         )
 
     with filter_col4:
-        payment_methods = bills_df[bills_df["payment_method"].notna()][
-            "payment_method"
-        ].unique().tolist()
-        all_payments = ["All Methods"] + sorted(payment_methods)
+        all_payments = _payment_options()
         selected_payment = st.selectbox(
             "💳 Payment Method", options=all_payments, key="payment_filter"
         )
@@ -587,29 +821,15 @@ def page_dashboard():
     # Apply the active filters to the bills data.
 
     # Filtering happens in SQL
-    filtered_data = get_filtered_bills(
-        start_date=start_date.strftime("%Y-%m-%d"),
-        end_date=end_date.strftime("%Y-%m-%d"),
-        min_amount=amount_range[0],
-        max_amount=amount_range[1],
-        vendor=selected_vendor,
-        payment_method=selected_payment,
-    )
-
-    filtered_df = pd.DataFrame(filtered_data)
-
-    if not filtered_df.empty:
-        filtered_df["purchase_date_dt"] = pd.to_datetime(
-            filtered_df["purchase_date"], errors="coerce"
-        )
-
-
-
-
-    
-
-    if selected_payment != "All Methods":
-        filtered_df = filtered_df[filtered_df["payment_method"] == selected_payment]
+    sql_filters = {
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "min_amount": amount_range[0],
+        "max_amount": amount_range[1],
+        "vendor": selected_vendor,
+        "payment_method": selected_payment,
+    }
+    filtered_df = _cached_filtered_bills(**sql_filters)
 
     # Filter summary and callout.
     summary_col1, summary_col2 = st.columns([3, 1])
@@ -639,19 +859,20 @@ def page_dashboard():
     st.markdown("<div class='dashboard-section-title'>📊 Insights & Trends</div>", unsafe_allow_html=True)
 
     # monthly_df = dashboard_analytics.monthly_spending(filtered_df)
-    #  Now aggregation happens in SQL, not Pandas.
-    monthly_data = get_monthly_spending()
-    monthly_df = pd.DataFrame(monthly_data)
+    #  Now aggregation happens in SQL, not Pandas, with the same filters applied.
+    monthly_df = pd.DataFrame(_cached_monthly_spending(**sql_filters))
 
-    monthly_tax_df = dashboard_analytics.monthly_tax_breakdown(filtered_df)
-    monthly_counts_df = dashboard_analytics.monthly_transaction_counts(filtered_df)
+    # Counts and tax split share one monthly groupby; each chart reads its own columns.
+    monthly_tax_df = monthly_counts_df = dashboard_analytics.monthly_breakdown(filtered_df)
     vendor_df = dashboard_analytics.top_vendors(filtered_df)
     payment_df = dashboard_analytics.payment_distribution(filtered_df)
 
-    all_items = _cached_items(bills)
-    items_df = dashboard_analytics.prepare_items_dataframe(all_items)
-    if not items_df.empty and "bill_id" in items_df.columns and "id" in filtered_df.columns:
-        items_df = items_df[items_df["bill_id"].isin(filtered_df["id"])].copy()
+    # Fetch items only for the filtered bills; the bill_id IN (...) filter runs
+    # in SQL, so no pandas isin() pass or copy is needed afterwards. Sorting the
+    # ids keeps the cache key stable regardless of row order.
+    bill_ids = tuple(sorted(filtered_df["id"].tolist()))
+    items_df = _cached_items_dataframe(bill_ids)
+    bill_insights = _cached_bill_insights(bill_ids, filtered_df)
 
     # Tabbed chart sections for simpler navigation
     # Segment charts by theme to keep the page scannable.
@@ -671,6 +892,7 @@ def page_dashboard():
                 st.plotly_chart(
                     dashboard_charts.monthly_spending_line(monthly_df),
                     width='content',
+                    key=_chart_key("chart_monthly", monthly_df),
                 )
                 st.caption("Total spending by month. Look for peaks to spot high-cost periods.")
                 insight = dashboard_insights.monthly_spending_insight(monthly_df)
@@ -683,6 +905,7 @@ def page_dashboard():
                 st.plotly_chart(
                     dashboard_charts.monthly_transactions_bar(monthly_counts_df),
                     width='content',
+                    key=_chart_key("chart_monthly_counts", monthly_counts_df),
                 )
                 st.caption("How many bills you had each month.")
                 insight = dashboard_insights.monthly_transactions_insight(monthly_counts_df)
@@ -697,6 +920,7 @@ def page_dashboard():
                 st.plotly_chart(
                     dashboard_charts.tax_vs_subtotal_bar(monthly_tax_df),
                     width='content',
+                    key=_chart_key("chart_monthly_tax", monthly_tax_df),
                 )
                 st.caption("Breakdown of subtotal vs tax for each month.")
                 insight = dashboard_insights.tax_vs_subtotal_insight(monthly_tax_df)
@@ -707,6 +931,7 @@ def page_dashboard():
                 st.plotly_chart(
                     dashboard_charts.cumulative_spending_line(monthly_df),
                     width='content',
+                    key=_chart_key("chart_cumulative", monthly_df),
                 )
                 st.caption("Running total of spending over time.")
                 insight = dashboard_insights.cumulative_spending_insight(monthly_df)
@@ -716,61 +941,40 @@ def page_dashboard():
         # Year-over-year (only shows if data spans multiple years)
         yoy_fig = dashboard_charts.yoy_comparison(filtered_df)
         if yoy_fig.data:
-            st.plotly_chart(yoy_fig, width='content')
+            st.plotly_chart(
+                yoy_fig,
+                width='content',
+                key=_chart_key("chart_yoy", bill_ids),
+            )
             st.caption("Compare the same months across different years.")
-            insight = dashboard_insights.yoy_insight(filtered_df)
+            insight = bill_insights["yoy"]
             if insight:
                 _render_insight_note(insight)
 
     # ---- TAB 2: Vendors & Payments ----
     with tab_vendors:
-        chart_col3, chart_col4 = st.columns(2)
-        with chart_col3:
-            if not vendor_df.empty:
-                st.plotly_chart(
-                    dashboard_charts.vendor_bar_chart(vendor_df),
-                    width='content',
-                )
-                st.caption("Top vendors by total spending.")
-                insight = dashboard_insights.vendor_insight(vendor_df)
-                if insight:
-                    _render_insight_note(insight)
-            else:
-                st.info("No vendor data available for this range.")
-        with chart_col4:
-            if not vendor_df.empty:
-                st.plotly_chart(
-                    dashboard_charts.vendor_pie_chart(vendor_df),
-                    width='content',
-                )
-                st.caption("Share of spending by vendor.")
-                insight = dashboard_insights.vendor_insight(vendor_df)
-                if insight:
-                    _render_insight_note(insight)
+        # Bar and donut share one figure per dimension: one payload per chart pair.
+        if not vendor_df.empty:
+            st.plotly_chart(
+                dashboard_charts.vendor_combined(vendor_df),
+                width='stretch',
+                key=_chart_key("chart_vendor", vendor_df),
+            )
+            st.caption("Top vendors by total spending and their share of spend.")
+            _render_insight_note(dashboard_insights.vendor_insight(vendor_df))
+        else:
+            st.info("No vendor data available for this range.")
 
-        chart_col_e, chart_col_f = st.columns(2)
-        with chart_col_e:
-            if not payment_df.empty:
-                st.plotly_chart(
-                    dashboard_charts.payment_method_bar(payment_df),
-                    width='content',
-                )
-                st.caption("Total spending by payment method.")
-                insight = dashboard_insights.payment_insight(payment_df)
-                if insight:
-                    _render_insight_note(insight)
-            else:
-                st.info("No payment method data available for this range.")
-        with chart_col_f:
-            if not payment_df.empty:
-                st.plotly_chart(
-                    dashboard_charts.payment_method_pie(payment_df),
-                    width='content',
-                )
-                st.caption("Payment method share of total spending.")
-                insight = dashboard_insights.payment_insight(payment_df)
-                if insight:
-                    _render_insight_note(insight)
+        if not payment_df.empty:
+            st.plotly_chart(
+                dashboard_charts.payment_combined(payment_df),
+                width='stretch',
+                key=_chart_key("chart_payment", payment_df),
+            )
+            st.caption("Total spending by payment method and each method's share.")
+            _render_insight_note(dashboard_insights.payment_insight(payment_df))
+        else:
+            st.info("No payment method data available for this range.")
 
     # ---- TAB 3: Spending Patterns ----
     with tab_patterns:
@@ -779,18 +983,20 @@ def page_dashboard():
             st.plotly_chart(
                 dashboard_charts.transaction_histogram(filtered_df),
                 width='content',
+                key=_chart_key("chart_histogram", bill_ids),
             )
             st.caption("Distribution of bill sizes. Most bills cluster near the center.")
-            insight = dashboard_insights.transaction_histogram_insight(filtered_df)
+            insight = bill_insights["histogram"]
             if insight:
                 _render_insight_note(insight)
         with chart_col6:
             st.plotly_chart(
                 dashboard_charts.day_of_week_bar(filtered_df),
                 width='content',
+                key=_chart_key("chart_day_of_week", bill_ids),
             )
             st.caption("Total spending by day of the week.")
-            insight = dashboard_insights.day_of_week_insight(filtered_df)
+            insight = bill_insights["day_of_week"]
             if insight:
                 _render_insight_note(insight)
 
@@ -805,6 +1011,7 @@ def page_dashboard():
                 st.plotly_chart(
                     dashboard_charts.top_items_bar(top_items_df),
                     width='content',
+                    key=_chart_key("chart_top_items", top_items_df),
                 )
                 st.caption("Items that cost the most overall.")
                 insight = dashboard_insights.top_items_insight(top_items_df)
@@ -817,6 +1024,7 @@ def page_dashboard():
                 st.plotly_chart(
                     dashboard_charts.frequent_items_bar(frequent_items_df),
                     width='content',
+                    key=_chart_key("chart_frequent_items", frequent_items_df),
                 )
                 st.caption("Items you buy most often.")
                 insight = dashboard_insights.frequent_items_insight(frequent_items_df)
@@ -827,83 +1035,4 @@ def page_dashboard():
 
     # ---- TAB 5: AI Insights ----
     with tab_ai:
-        st.markdown(
-            """
-            <div class='ai-tab-hero'>
-                <p class='ai-tab-hero-title'>🤖 AI Insights Studio</p>
-                <p class='ai-tab-hero-subtitle'>
-                    Turn your filtered bills into concise, actionable insights using Gemini.
-                    Generate a narrative summary of trends, vendor behavior, and payment patterns.
-                </p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        ai_metric_col1, ai_metric_col2, ai_metric_col3 = st.columns(3)
-        with ai_metric_col1:
-            st.metric("📌 Records in Scope", f"{len(filtered_df):,}")
-        with ai_metric_col2:
-            st.metric("💳 Payment Methods", f"{payment_df['payment_method'].nunique() if not payment_df.empty else 0}")
-        with ai_metric_col3:
-            st.metric("🏪 Vendors in Scope", f"{vendor_df['vendor_name'].nunique() if not vendor_df.empty else 0}")
-
-        st.markdown(
-            """
-            <div class='ai-action-card'>
-                <p class='ai-action-title'>✨ Generate Insight Narrative</p>
-                <p class='ai-action-subtitle'>Create a polished explanation of spending trends for the currently selected filters.</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        if not st.session_state.get("api_key"):
-            st.markdown(
-                """
-                <div class='ai-info-card'>
-                    Add your Gemini API key in the sidebar to unlock AI-generated insights.
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        else:
-            summary = dashboard_ai_insights.build_summary(
-                filtered_df,
-                vendor_df,
-                payment_df,
-                items_df,
-            )
-            summary_key = dashboard_ai_insights.summary_hash(summary)
-
-            if st.button(
-                "✨ Generate AI Insights",
-                key="ai_insights_generate",
-                type="primary",
-                use_container_width=True,
-            ):
-                with st.spinner("Generating insights with Gemini..."):
-                    result = dashboard_ai_insights.generate_ai_insights(
-                        summary,
-                        st.session_state.get("api_key"),
-                    )
-                if result.get("error"):
-                    st.error(result["error"])
-                else:
-                    st.session_state["ai_insights_text"] = result.get("text", "")
-                    st.session_state["ai_insights_key"] = summary_key
-
-            cached_text = st.session_state.get("ai_insights_text")
-            cached_key = st.session_state.get("ai_insights_key")
-
-            if cached_text and cached_key == summary_key:
-                _render_ai_insights(cached_text)
-            elif cached_text and cached_key != summary_key:
-                st.markdown(
-                    """
-                    <div class='ai-refresh-hint'>
-                        Filters changed since the last run. Click <strong>Generate AI Insights</strong> to refresh.
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+        _render_ai_tab(bill_ids, filtered_df, vendor_df, payment_df, items_df)
@@ -2,6 +2,7 @@
 
 from io import BytesIO
 import pandas as pd
+import xlsxwriter
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
@@ -22,6 +23,41 @@ def export_csv(bills_df):
 	return bills_df.to_csv(index=False).encode("utf-8")
 
 
+def _excel_bytes(df, sheet_name):
+	"""Write a dataframe to a single-sheet Excel workbook.
+
+	Rows go straight to xlsxwriter with write_row instead of through
+	pandas' per-cell formatter objects.
+
+	Args:
+		df: DataFrame to write.
+		sheet_name: Worksheet name.
+
+	Returns:
+		Excel file bytes.
+	"""
+	output = BytesIO()
+	# Datetimes get pandas' default cell format instead of raw serials.
+	workbook = xlsxwriter.Workbook(
+		output, {"in_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"}
+	)
+	worksheet = workbook.add_worksheet(sheet_name)
+
+	# Same header style as pandas' to_excel so the workbook looks unchanged.
+	header_format = workbook.add_format(
+		{"bold": True, "border": 1, "align": "center", "valign": "top"}
+	)
+	worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+
+	# Missing values become blank cells, like pandas' default na_rep="".
+	values = df.astype(object).where(df.notna(), None)
+	for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+		worksheet.write_row(row_idx, 0, row)
+
+	workbook.close()
+	return output.getvalue()
+
+
 def export_excel(bills_df):
 	"""Export the bills dataframe to an Excel workbook.
 
@@ -31,12 +67,32 @@ def export_excel(bills_df):
 	Returns:
 		Excel file bytes with a single "Bills" worksheet.
 	"""
-	output = BytesIO()
 	# Single-sheet export for the summary bills table.
-	with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-		# Keep the worksheet name stable for consumers.
-		bills_df.to_excel(writer, index=False, sheet_name="Bills")
-	return output.getvalue()
+	# Keep the worksheet name stable for consumers.
+	return _excel_bytes(bills_df, "Bills")
+
+
+def _table_rows(df, columns):
+	"""Convert selected dataframe columns into string rows for a PDF table.
+
+	Args:
+		df: DataFrame to render.
+		columns: Column names in table order; missing columns render blank.
+
+	Returns:
+		List of rows, each a list of strings.
+	"""
+	# Convert all values to strings to satisfy ReportLab cell expectations.
+	# Stringify column by column and zip into rows, skipping the 2-D object
+	# array that DataFrame.to_numpy() would build for mixed dtypes. Missing
+	# values are masked per column; a frame-wide fillna("") on object columns
+	# triggers pandas' downcasting FutureWarning.
+	table = df.reindex(columns=columns)
+	cols = [
+		table[col].astype(str).where(table[col].notna(), "").tolist()
+		for col in columns
+	]
+	return [list(row) for row in zip(*cols)]
 
 
 def export_pdf(bills_df):
@@ -75,10 +131,7 @@ def export_pdf(bills_df):
 
 	# Build the table header and rows in the same order as field_map.
 	headers = [label for _, label in field_map]
-	table_data = [headers]
-	for _, row in bills_df.iterrows():
-		# Convert all values to strings to satisfy ReportLab cell expectations.
-		table_data.append([str(row.get(key, "")) for key, _ in field_map])
+	table_data = [headers] + _table_rows(bills_df, [key for key, _ in field_map])
 
 	# Minimal styling for readability in the PDF table.
 	table = Table(table_data, repeatRows=1)
@@ -99,6 +152,70 @@ def export_pdf(bills_df):
 	return pdf_buffer.getvalue()
 
 
+# Bill and line-item columns for the detailed CSV/Excel exports, in output order.
+_DETAILED_BILL_COLUMNS = {
+	"id": "Bill_ID",
+	"invoice_number": "Invoice_Number",
+	"vendor_name": "Vendor_Name",
+	"purchase_date": "Purchase_Date",
+	"purchase_time": "Purchase_Time",
+	"payment_method": "Payment_Method",
+	"subtotal": "Bill_Subtotal",
+	"tax_amount": "Bill_Tax",
+	"total_amount": "Bill_Total",
+	"currency": "Currency",
+}
+_DETAILED_ITEM_COLUMNS = {
+	"s_no": "Item_SNo",
+	"item_name": "Item_Name",
+	"quantity": "Item_Quantity",
+	"unit_price": "Item_Unit_Price",
+	"item_total": "Item_Total",
+}
+
+
+def _detailed_frame(bills_df, items_df, bill_columns, item_columns, item_name_column):
+	"""Join bills to their line items with one row per item.
+
+	Args:
+		bills_df: DataFrame containing bill records.
+		items_df: DataFrame containing line items with a bill_id column.
+		bill_columns: Mapping of bill column to output column; must include "id".
+		item_columns: Mapping of line item column to output column.
+		item_name_column: Output column that carries the placeholder text.
+
+	Returns:
+		DataFrame in bill order, with a "No line items" row for bills without items.
+	"""
+	# Missing source columns export as blanks, matching row.get(key, "").
+	bills_sub = bills_df.reindex(columns=list(bill_columns), fill_value="").rename(
+		columns=bill_columns
+	)
+	bill_key = bill_columns["id"]
+
+	if "bill_id" in items_df.columns:
+		# Object dtype keeps integer item fields from turning into floats
+		# when the left join introduces missing rows.
+		items_sub = (
+			items_df.reindex(columns=list(item_columns), fill_value="")
+			.astype(object)
+			.rename(columns=item_columns)
+		)
+		items_sub.insert(0, bill_key, items_df["bill_id"].to_numpy())
+	else:
+		items_sub = pd.DataFrame(columns=[bill_key, *item_columns.values()])
+
+	# A left join keeps bill order and each bill's item order.
+	merged = bills_sub.merge(items_sub, on=bill_key, how="left", indicator=True)
+
+	# Include a placeholder row so every bill appears in the export.
+	no_items = merged.pop("_merge").eq("left_only").to_numpy()
+	if no_items.any():
+		merged.loc[no_items, list(item_columns.values())] = ""
+		merged.loc[no_items, item_name_column] = "No line items"
+	return merged
+
+
 def export_detailed_csv(bills_df, items_df):
 	"""Export detailed bills with line items to CSV bytes.
 
@@ -110,64 +227,9 @@ def export_detailed_csv(bills_df, items_df):
 		UTF-8 encoded CSV bytes with one row per line item.
 	"""
 	# Build a flattened table where each line item becomes a row.
-	detailed_data = []
-	for _, bill in bills_df.iterrows():
-		bill_id = bill.get("id")
-		# Match line items for the current bill; fall back to empty list if missing.
-		# Pull all line items that match the current bill.
-		bill_items = (
-			items_df[items_df["bill_id"] == bill_id]
-			if "bill_id" in items_df.columns
-			else []
-		)
-
-		# Add one row per line item, or a placeholder when none exist.
-		if len(bill_items) > 0:
-			for _, item in bill_items.iterrows():
-				# Duplicate bill metadata so each item row is self-contained.
-				detailed_data.append(
-					{
-						"Bill_ID": bill_id,
-						"Invoice_Number": bill.get("invoice_number", ""),
-						"Vendor_Name": bill.get("vendor_name", ""),
-						"Purchase_Date": bill.get("purchase_date", ""),
-						"Purchase_Time": bill.get("purchase_time", ""),
-						"Payment_Method": bill.get("payment_method", ""),
-						"Bill_Subtotal": bill.get("subtotal", ""),
-						"Bill_Tax": bill.get("tax_amount", ""),
-						"Bill_Total": bill.get("total_amount", ""),
-						"Currency": bill.get("currency", ""),
-						"Item_SNo": item.get("s_no", ""),
-						"Item_Name": item.get("item_name", ""),
-						"Item_Quantity": item.get("quantity", ""),
-						"Item_Unit_Price": item.get("unit_price", ""),
-						"Item_Total": item.get("item_total", ""),
-					}
-				)
-		else:
-			# Include a placeholder row so every bill appears in the export.
-			detailed_data.append(
-				{
-					"Bill_ID": bill_id,
-					"Invoice_Number": bill.get("invoice_number", ""),
-					"Vendor_Name": bill.get("vendor_name", ""),
-					"Purchase_Date": bill.get("purchase_date", ""),
-					"Purchase_Time": bill.get("purchase_time", ""),
-					"Payment_Method": bill.get("payment_method", ""),
-					"Bill_Subtotal": bill.get("subtotal", ""),
-					"Bill_Tax": bill.get("tax_amount", ""),
-					"Bill_Total": bill.get("total_amount", ""),
-					"Currency": bill.get("currency", ""),
-					"Item_SNo": "",
-					"Item_Name": "No line items",
-					"Item_Quantity": "",
-					"Item_Unit_Price": "",
-					"Item_Total": "",
-				}
-			)
-
-	# Turn the flattened list into a DataFrame for CSV output.
-	detailed_df = pd.DataFrame(detailed_data)
+	detailed_df = _detailed_frame(
+		bills_df, items_df, _DETAILED_BILL_COLUMNS, _DETAILED_ITEM_COLUMNS, "Item_Name"
+	)
 	return detailed_df.to_csv(index=False).encode("utf-8")
 
 
@@ -181,72 +243,13 @@ def export_detailed_excel(bills_df, items_df):
 	Returns:
 		Excel file bytes with a "Detailed View" worksheet.
 	"""
-	output = BytesIO()
-
-	with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-		# Keep Excel columns aligned with the detailed CSV export.
-		detailed_data = []
-		for _, bill in bills_df.iterrows():
-			bill_id = bill.get("id")
-			# Match line items for the current bill; fall back to empty list if missing.
-			# Match line items to the current bill for the detailed view.
-			bill_items = (
-				items_df[items_df["bill_id"] == bill_id]
-				if "bill_id" in items_df.columns
-				else []
-			)
-
-			# Add one row per line item, or a placeholder when none exist.
-			if len(bill_items) > 0:
-				for _, item in bill_items.iterrows():
-					# Duplicate bill metadata so each item row is self-contained.
-					detailed_data.append(
-						{
-							"Bill_ID": bill_id,
-							"Invoice_Number": bill.get("invoice_number", ""),
-							"Vendor_Name": bill.get("vendor_name", ""),
-							"Purchase_Date": bill.get("purchase_date", ""),
-							"Purchase_Time": bill.get("purchase_time", ""),
-							"Payment_Method": bill.get("payment_method", ""),
-							"Bill_Subtotal": bill.get("subtotal", ""),
-							"Bill_Tax": bill.get("tax_amount", ""),
-							"Bill_Total": bill.get("total_amount", ""),
-							"Currency": bill.get("currency", ""),
-							"Item_SNo": item.get("s_no", ""),
-							"Item_Name": item.get("item_name", ""),
-							"Item_Quantity": item.get("quantity", ""),
-							"Item_Unit_Price": item.get("unit_price", ""),
-							"Item_Total": item.get("item_total", ""),
-						}
-					)
-			else:
-				# Include a placeholder row so every bill appears in the export.
-				detailed_data.append(
-					{
-						"Bill_ID": bill_id,
-						"Invoice_Number": bill.get("invoice_number", ""),
-						"Vendor_Name": bill.get("vendor_name", ""),
-						"Purchase_Date": bill.get("purchase_date", ""),
-						"Purchase_Time": bill.get("purchase_time", ""),
-						"Payment_Method": bill.get("payment_method", ""),
-						"Bill_Subtotal": bill.get("subtotal", ""),
-						"Bill_Tax": bill.get("tax_amount", ""),
-						"Bill_Total": bill.get("total_amount", ""),
-						"Currency": bill.get("currency", ""),
-						"Item_SNo": "",
-						"Item_Name": "No line items",
-						"Item_Quantity": "",
-						"Item_Unit_Price": "",
-						"Item_Total": "",
-					}
-				)
-
-		# Convert the flattened rows to a DataFrame for Excel output.
-		detailed_df = pd.DataFrame(detailed_data)
-		# Write the detailed data as a single worksheet.
-		detailed_df.to_excel(writer, index=False, sheet_name="Detailed View")
+	# Keep Excel columns aligned with the detailed CSV export.
+	detailed_df = _detailed_frame(
+		bills_df, items_df, _DETAILED_BILL_COLUMNS, _DETAILED_ITEM_COLUMNS, "Item_Name"
+	)
 
-	return output.getvalue()
+	# Write the detailed data as a single worksheet.
+	return _excel_bytes(detailed_df, "Detailed View")
 
 
 def export_detailed_pdf(bills_df, items_df):
@@ -285,49 +288,17 @@ def export_detailed_pdf(bills_df, items_df):
 		("item_total", "Item Total"),
 	]
 
-	# Build the table header and rows.
+	# Build the table header and rows from the same bill-item join as the
+	# CSV/Excel exports, keeping the lowercase keys used by this table.
 	headers = [label for _, label in columns]
-	table_data = [headers]
-
-	for _, bill in bills_df.iterrows():
-		bill_id = bill.get("id")
-		bill_items = (
-			items_df[items_df["bill_id"] == bill_id]
-			if "bill_id" in items_df.columns
-			else pd.DataFrame()
-		)
-
-		# Add a placeholder row when no line items exist.
-		if bill_items.empty:
-			row = {
-				"bill_id": bill_id,
-				"invoice_number": bill.get("invoice_number", ""),
-				"vendor_name": bill.get("vendor_name", ""),
-				"purchase_date": bill.get("purchase_date", ""),
-				"s_no": "",
-				"item_name": "No line items",
-				"quantity": "",
-				"unit_price": "",
-				"item_total": "",
-			}
-			# Convert all values to strings to satisfy ReportLab cell expectations.
-			table_data.append([str(row.get(key, "")) for key, _ in columns])
-			continue
-
-		for _, item in bill_items.iterrows():
-			row = {
-				"bill_id": bill_id,
-				"invoice_number": bill.get("invoice_number", ""),
-				"vendor_name": bill.get("vendor_name", ""),
-				"purchase_date": bill.get("purchase_date", ""),
-				"s_no": item.get("s_no", ""),
-				"item_name": item.get("item_name", ""),
-				"quantity": item.get("quantity", ""),
-				"unit_price": item.get("unit_price", ""),
-				"item_total": item.get("item_total", ""),
-			}
-			# Convert all values to strings to satisfy ReportLab cell expectations.
-			table_data.append([str(row.get(key, "")) for key, _ in columns])
+	detailed_df = _detailed_frame(
+		bills_df,
+		items_df,
+		{"id": "bill_id", **{key: key for key, _ in columns[1:4]}},
+		{key: key for key, _ in columns[4:]},
+		"item_name",
+	)
+	table_data = [headers] + _table_rows(detailed_df, [key for key, _ in columns])
 
 	# Minimal styling for readability in the PDF table.
 	table = Table(table_data, repeatRows=1)
@@ -24,8 +24,9 @@ def monthly_spending_insight(monthly_df: pd.DataFrame) -> Optional[str]:
 		return None
 
 	# Highlight the peak month and compare the most recent month to the prior one.
-	df = monthly_df.sort_values("month")
-	top_row = df.loc[df["total_amount"].idxmax()]
+	# Monthly frames arrive month-ordered (SQL ORDER BY month / period groupby).
+	df = monthly_df
+	top_row = df.iloc[df["total_amount"].argmax()]
 	insight = (
 		f"Highest spending month: {top_row['month']} at "
 		f"{_format_currency(top_row['total_amount'])}."
@@ -49,8 +50,8 @@ def monthly_transactions_insight(monthly_counts_df: pd.DataFrame) -> Optional[st
 		return None
 
 	# Point out the busiest month and typical monthly volume.
-	df = monthly_counts_df.sort_values("month")
-	top_row = df.loc[df["transactions"].idxmax()]
+	df = monthly_counts_df
+	top_row = df.iloc[df["transactions"].argmax()]
 	avg = df["transactions"].mean()
 	return (
 		f"Busiest month: {top_row['month']} with {int(top_row['transactions'])} bills. "
@@ -68,7 +69,7 @@ def tax_vs_subtotal_insight(monthly_tax_df: pd.DataFrame) -> Optional[str]:
 	avg_rate = _safe_pct(total_tax, total_amount)
 
 	if "tax_percentage" in monthly_tax_df.columns:
-		top_row = monthly_tax_df.loc[monthly_tax_df["tax_percentage"].idxmax()]
+		top_row = monthly_tax_df.iloc[monthly_tax_df["tax_percentage"].argmax()]
 		return (
 			f"Average tax rate is {avg_rate:.1f}%. "
 			f"Highest tax share was {top_row['tax_percentage']:.1f}% in {top_row['month']}."
@@ -95,15 +96,14 @@ def yoy_insight(df: pd.DataFrame) -> Optional[str]:
 		return None
 
 	# Only report if we have at least two years of data.
-	data = df.dropna(subset=["purchase_date_dt"]).copy()
-	data["year"] = data["purchase_date_dt"].dt.year
-	yearly = data.groupby("year")["total_amount"].sum().reset_index()
+	# Grouping on the derived year Series skips a frame copy; NaT keys drop out.
+	yearly = df.groupby(df["purchase_date_dt"].dt.year)["total_amount"].sum()
 
-	if yearly["year"].nunique() < 2:
+	if len(yearly) < 2:
 		return None
 
-	top_year = yearly.loc[yearly["total_amount"].idxmax()]
-	return f"Strongest year is {int(top_year['year'])} at {_format_currency(top_year['total_amount'])}."
+	top_year = yearly.idxmax()
+	return f"Strongest year is {int(top_year)} at {_format_currency(yearly[top_year])}."
 
 
 def vendor_insight(vendor_df: pd.DataFrame) -> Optional[str]:
@@ -112,7 +112,7 @@ def vendor_insight(vendor_df: pd.DataFrame) -> Optional[str]:
 
 	# Emphasize the top vendor and its share of total spend.
 	total = vendor_df["total_spent"].sum()
-	top_row = vendor_df.loc[vendor_df["total_spent"].idxmax()]
+	top_row = vendor_df.iloc[vendor_df["total_spent"].argmax()]
 	share = _safe_pct(top_row["total_spent"], total)
 	return (
 		f"Top vendor is {top_row['vendor_name']} at {_format_currency(top_row['total_spent'])} "
@@ -126,7 +126,7 @@ def payment_insight(payment_df: pd.DataFrame) -> Optional[str]:
 
 	# Emphasize the most used payment method and its share.
 	total = payment_df["total_amount"].sum()
-	top_row = payment_df.loc[payment_df["total_amount"].idxmax()]
+	top_row = payment_df.iloc[payment_df["total_amount"].argmax()]
 	share = _safe_pct(top_row["total_amount"], total)
 	return (
 		f"Most used method is {top_row['payment_method']} at {_format_currency(top_row['total_amount'])} "
@@ -152,9 +152,7 @@ def day_of_week_insight(df: pd.DataFrame) -> Optional[str]:
 		return None
 
 	# Identify the day with the highest total spend.
-	data = df.dropna(subset=["purchase_date_dt"]).copy()
-	data["day_name"] = data["purchase_date_dt"].dt.day_name()
-	day_totals = data.groupby("day_name")["total_amount"].sum()
+	day_totals = df.groupby(df["purchase_date_dt"].dt.day_name())["total_amount"].sum()
 	if day_totals.empty:
 		return None
 
@@ -169,7 +167,7 @@ def top_items_insight(items_df: pd.DataFrame) -> Optional[str]:
 
 	# Call out the single largest contributor to item spend.
 	total = items_df["item_total"].sum()
-	top_row = items_df.loc[items_df["item_total"].idxmax()]
+	top_row = items_df.iloc[items_df["item_total"].argmax()]
 	share = _safe_pct(top_row["item_total"], total)
 	return (
 		f"Top item by spend is {top_row['item_name']} at {_format_currency(top_row['item_total'])} "
@@ -183,7 +181,7 @@ def frequent_items_insight(freq_df: pd.DataFrame) -> Optional[str]:
 
 	# Call out the most frequently purchased item and its share of counts.
 	total = freq_df["purchase_count"].sum()
-	top_row = freq_df.loc[freq_df["purchase_count"].idxmax()]
+	top_row = freq_df.iloc[freq_df["purchase_count"].argmax()]
 	share = _safe_pct(top_row["purchase_count"], total)
 	return (
 		f"Most purchased item is {top_row['item_name']} with {int(top_row['purchase_count'])} purchases "
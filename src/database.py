@@ -5,9 +5,11 @@
 
 import os
 import sqlite3
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import pandas as pd
+
 # SQLite database file location - can be overridden via environment variable
 # Defaults to 'receipt_invoice.db' in the current directory
 DB_PATH = os.getenv("SQLITE_DB_PATH", "receipt_invoice.db")
@@ -103,75 +105,80 @@ def init_db():
             ON bills(total_amount)
         """)
 
+        # Covering index for dashboard KPI/monthly roll-ups: date-range queries
+        # over these dimensions and measures are answered from the index alone
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_bills_kpi_cover
+            ON bills(purchase_date, total_amount, tax_amount, vendor_name, payment_method)
+        """)
+
         
 
         conn.commit()
     finally:
         conn.close()
 
-# Filtered Query Function (Very Important Optimization)
-
-def get_filtered_bills(start_date=None, end_date=None,
-                       min_amount=None, max_amount=None,
-                       vendor=None, payment_method=None):
-    conn = get_connection()
-    try:
-        cursor = conn.cursor()
-
-        query = """
-            SELECT bill_id AS id,
-                   vendor_name,
-                   purchase_date,
-                   subtotal,
-                   tax_amount,
-                   total_amount,
-                   payment_method
-            FROM bills
-            WHERE 1=1
-        """
-
-        params = []
+def _bill_filter_clause(start_date=None, end_date=None,
+                        min_amount=None, max_amount=None,
+                        vendor=None, payment_method=None) -> Tuple[str, list]:
+    """Build the shared dashboard filter conditions for a bills query.
 
-        if start_date and end_date:
-            query += " AND purchase_date BETWEEN ? AND ?"
-            params.extend([start_date, end_date])
+    Args:
+        start_date: Inclusive start date (YYYY-MM-DD); used with end_date
+        end_date: Inclusive end date (YYYY-MM-DD); used with start_date
+        min_amount: Inclusive minimum total; used with max_amount
+        max_amount: Inclusive maximum total; used with min_amount
+        vendor: Vendor name, or "All Vendors" for no filter
+        payment_method: Payment method, or "All Methods" for no filter
 
-        if min_amount is not None and max_amount is not None:
-            query += " AND total_amount BETWEEN ? AND ?"
-            params.extend([min_amount, max_amount])
+    Returns:
+        Tuple of (" AND ..." clause to append after WHERE 1=1, bound parameters)
+    """
+    clause = ""
+    params = []
 
-        if vendor and vendor != "All Vendors":
-            query += " AND vendor_name = ?"
-            params.append(vendor)
+    if start_date and end_date:
+        clause += " AND purchase_date BETWEEN ? AND ?"
+        params.extend([start_date, end_date])
 
-        if payment_method and payment_method != "All Methods":
-            query += " AND payment_method = ?"
-            params.append(payment_method)
+    if min_amount is not None and max_amount is not None:
+        clause += " AND total_amount BETWEEN ? AND ?"
+        params.extend([min_amount, max_amount])
 
-        query += " ORDER BY bill_id DESC"
+    if vendor and vendor != "All Vendors":
+        clause += " AND vendor_name = ?"
+        params.append(vendor)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+    if payment_method and payment_method != "All Methods":
+        clause += " AND payment_method = ?"
+        params.append(payment_method)
 
-        return [dict(r) for r in rows]
+    return clause, params
 
-    finally:
-        conn.close()
 
+# Optimize Reports Using SQL Aggregation
 
-    # Optimize Reports Using SQL Aggregation
-
-def get_monthly_spending():
+def get_monthly_spending(start_date=None, end_date=None,
+                         min_amount=None, max_amount=None,
+                         vendor=None, payment_method=None):
     conn = get_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute("""
+
+        query = """
             SELECT strftime('%Y-%m', purchase_date) AS month,
                    SUM(total_amount) AS total_amount
             FROM bills
-            GROUP BY month
-            ORDER BY month
-        """)
+            WHERE 1=1
+        """
+
+        # Same filter semantics as get_filtered_bills
+        clause, params = _bill_filter_clause(
+            start_date, end_date, min_amount, max_amount, vendor, payment_method
+        )
+        query += clause + " GROUP BY month ORDER BY month"
+
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         return [
             {
@@ -184,6 +191,131 @@ def get_monthly_spending():
         conn.close()
 
 
+def get_distinct_vendors() -> List[str]:
+    """Fetch sorted distinct vendor names (served from idx_bills_vendor).
+
+    Returns:
+        List of vendor names, excluding NULLs
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT DISTINCT vendor_name
+            FROM bills
+            WHERE vendor_name IS NOT NULL
+            ORDER BY vendor_name
+            """
+        )
+        return [r["vendor_name"] for r in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def get_distinct_payment_methods() -> List[str]:
+    """Fetch sorted distinct payment methods (served from idx_bills_payment_method).
+
+    Returns:
+        List of payment methods, excluding NULLs
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT DISTINCT payment_method
+            FROM bills
+            WHERE payment_method IS NOT NULL
+            ORDER BY payment_method
+            """
+        )
+        return [r["payment_method"] for r in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def get_month_kpi_window(current_month_start: str, prev_month_start: str) -> Dict[str, Dict]:
+    """Aggregate KPI figures for the current and previous month in SQL.
+
+    Args:
+        current_month_start: First day of the current month (YYYY-MM-DD)
+        prev_month_start: First day of the previous month (YYYY-MM-DD)
+
+    Returns:
+        Dictionary with "current" and "previous" keys, each holding spend, bills,
+        avg_bill, median_bill, max_bill, tax_amount and vendors for that window
+    """
+    empty = {
+        "spend": 0.0,
+        "bills": 0,
+        "avg_bill": 0.0,
+        "median_bill": 0.0,
+        "max_bill": 0.0,
+        "tax_amount": 0.0,
+        "vendors": 0,
+    }
+    window = {"current": dict(empty), "previous": dict(empty)}
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Bucket rows into the two windows so one scan serves both KPI cards
+        window_expr = """
+            CASE WHEN purchase_date >= :current THEN 'current' ELSE 'previous' END
+        """
+        cursor.execute(
+            f"""
+            SELECT {window_expr} AS bucket,
+                   SUM(total_amount) AS spend,
+                   COUNT(*) AS bills,
+                   AVG(total_amount) AS avg_bill,
+                   MAX(total_amount) AS max_bill,
+                   SUM(tax_amount) AS tax_amount,
+                   COUNT(DISTINCT vendor_name) AS vendors
+            FROM bills
+            WHERE purchase_date >= :prev
+            GROUP BY bucket
+            """,
+            {"current": current_month_start, "prev": prev_month_start},
+        )
+        for r in cursor.fetchall():
+            window[r["bucket"]].update(
+                {
+                    "spend": float(r["spend"] or 0),
+                    "bills": int(r["bills"] or 0),
+                    "avg_bill": float(r["avg_bill"] or 0),
+                    "max_bill": float(r["max_bill"] or 0),
+                    "tax_amount": float(r["tax_amount"] or 0),
+                    "vendors": int(r["vendors"] or 0),
+                }
+            )
+
+        # SQLite has no MEDIAN aggregate; pull the (small) two-month slice.
+        # No ORDER BY: sorting on total_amount makes the planner walk the whole
+        # amount index instead of seeking the date index to the window start.
+        cursor.execute(
+            f"""
+            SELECT {window_expr} AS bucket, total_amount
+            FROM bills
+            WHERE purchase_date >= :prev
+            """,
+            {"current": current_month_start, "prev": prev_month_start},
+        )
+        amounts = {"current": [], "previous": []}
+        for r in cursor.fetchall():
+            amounts[r["bucket"]].append(float(r["total_amount"] or 0))
+        for key, values in amounts.items():
+            if values:
+                values.sort()
+                mid = len(values) // 2
+                window[key]["median_bill"] = (
+                    values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+                )
+
+        return window
+    finally:
+        conn.close()
 
 
 def insert_bill(bill_data: Dict, user_id: int = 1, currency: str = "USD", file_path: Optional[str] = None) -> int:
@@ -326,6 +458,8 @@ def get_all_bills() -> List[Dict]:
     finally:
         conn.close()
 
+# Filtered Query Function (Very Important Optimization)
+
 def get_filtered_bills(start_date=None, end_date=None,
                        min_amount=None, max_amount=None,
                        vendor=None, payment_method=None):
@@ -345,25 +479,10 @@ def get_filtered_bills(start_date=None, end_date=None,
             WHERE 1=1
         """
 
-        params = []
-
-        if start_date and end_date:
-            query += " AND purchase_date BETWEEN ? AND ?"
-            params.extend([start_date, end_date])
-
-        if min_amount is not None and max_amount is not None:
-            query += " AND total_amount BETWEEN ? AND ?"
-            params.extend([min_amount, max_amount])
-
-        if vendor and vendor != "All Vendors":
-            query += " AND vendor_name = ?"
-            params.append(vendor)
-
-        if payment_method and payment_method != "All Methods":
-            query += " AND payment_method = ?"
-            params.append(payment_method)
-
-        query += " ORDER BY bill_id DESC"
+        clause, params = _bill_filter_clause(
+            start_date, end_date, min_amount, max_amount, vendor, payment_method
+        )
+        query += clause + " ORDER BY bill_id DESC"
 
         cursor.execute(query, params)
         rows = cursor.fetchall()
@@ -385,6 +504,85 @@ def get_filtered_bills(start_date=None, end_date=None,
         conn.close()
 
 
+# DataFrame Query Functions
+# Build dashboard frames straight from the cursor with pd.read_sql_query: the
+# per-row defaults above move into COALESCE/NULLIF so no list of dicts is made
+
+def get_all_bills_df() -> pd.DataFrame:
+    """Fetch all bills as a DataFrame with the same fields and defaults as get_all_bills.
+
+    Returns:
+        DataFrame of bills sorted by newest first (columns present even when empty)
+    """
+    conn = get_connection()
+    try:
+        df = pd.read_sql_query(
+            """
+            SELECT bill_id AS id,
+                   invoice_number,
+                   vendor_name,
+                   purchase_date,
+                   purchase_time,
+                   COALESCE(subtotal, 0.0) AS subtotal,
+                   COALESCE(tax_amount, 0.0) AS tax_amount,
+                   COALESCE(total_amount, 0.0) AS total_amount,
+                   COALESCE(NULLIF(currency, ''), 'USD') AS currency,
+                   original_currency,
+                   NULLIF(original_total_amount, 0) AS original_total_amount,
+                   NULLIF(exchange_rate, 0) AS exchange_rate,
+                   payment_method,
+                   COALESCE(parsed_with_template, 0) != 0 AS parsed_with_template
+            FROM bills
+            ORDER BY bill_id DESC
+            """,
+            conn,
+        )
+        df["parsed_with_template"] = df["parsed_with_template"].astype(bool)
+        return df
+    finally:
+        conn.close()
+
+
+def get_filtered_bills_df(start_date=None, end_date=None,
+                          min_amount=None, max_amount=None,
+                          vendor=None, payment_method=None) -> pd.DataFrame:
+    """Fetch filtered bills as a DataFrame with the same fields as get_filtered_bills.
+
+    Args:
+        start_date: Inclusive start date (YYYY-MM-DD); used with end_date
+        end_date: Inclusive end date (YYYY-MM-DD); used with start_date
+        min_amount: Inclusive minimum total; used with max_amount
+        max_amount: Inclusive maximum total; used with min_amount
+        vendor: Vendor name, or "All Vendors" for no filter
+        payment_method: Payment method, or "All Methods" for no filter
+
+    Returns:
+        DataFrame of matching bills sorted by newest first (columns present even when empty)
+    """
+    clause, params = _bill_filter_clause(
+        start_date, end_date, min_amount, max_amount, vendor, payment_method
+    )
+    conn = get_connection()
+    try:
+        return pd.read_sql_query(
+            """
+            SELECT bill_id AS id,
+                   vendor_name,
+                   purchase_date,
+                   COALESCE(subtotal, 0.0) AS subtotal,
+                   COALESCE(tax_amount, 0.0) AS tax_amount,
+                   COALESCE(total_amount, 0.0) AS total_amount,
+                   payment_method
+            FROM bills
+            WHERE 1=1
+            """ + clause + " ORDER BY bill_id DESC",
+            conn,
+            params=params,
+        )
+    finally:
+        conn.close()
+
+
 
 def get_bill_items(bill_id: int) -> List[Dict]:
     """Fetch all line items for a specific bill.
@@ -428,6 +626,72 @@ def get_bill_items(bill_id: int) -> List[Dict]:
         conn.close()
 
 
+# SQLite caps bound parameters per statement (999 on older builds)
+_MAX_IN_PARAMS = 900
+
+
+def get_items_for_bills(bill_ids: List[int]) -> List[Dict]:
+    """Fetch line items for many bills in batched queries, joined with bill metadata.
+
+    Args:
+        bill_ids: Primary keys of bills to fetch items for
+
+    Returns:
+        List of line items with the columns selected by get_bill_items (item id,
+        name, quantity, prices) plus bill_id, vendor_name, purchase_date and
+        per-bill sequential numbering
+    """
+    ids = [bill_id for bill_id in bill_ids if bill_id is not None]
+    if not ids:
+        return []
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        items = []
+        s_no_by_bill = {}
+        # Chunk the IN list to stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), _MAX_IN_PARAMS):
+            chunk = ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(
+                f"""
+                SELECT l.item_id AS id,
+                       l.bill_id,
+                       l.description AS item_name,
+                       l.quantity,
+                       l.unit_price,
+                       l.total_price AS item_total,
+                       b.vendor_name,
+                       b.purchase_date
+                FROM lineitems l
+                JOIN bills b ON b.bill_id = l.bill_id
+                WHERE l.bill_id IN ({placeholders})
+                ORDER BY l.bill_id, l.item_id
+                """,
+                chunk,
+            )
+            for r in cursor.fetchall():
+                bill_id = r["bill_id"]
+                s_no_by_bill[bill_id] = s_no_by_bill.get(bill_id, 0) + 1
+                items.append(
+                    {
+                        "id": r["id"],
+                        "s_no": s_no_by_bill[bill_id],
+                        "item_name": r["item_name"] or "",
+                        "quantity": r["quantity"] or 0,
+                        "unit_price": float(r["unit_price"] or 0),
+                        "item_total": float(r["item_total"] or 0),
+                        "bill_id": bill_id,
+                        "vendor_name": r["vendor_name"],
+                        "purchase_date": r["purchase_date"],
+                    }
+                )
+        return items
+    finally:
+        conn.close()
+
+
 def get_bill_details(bill_id: int) -> Optional[Dict]:
     """Fetch complete bill data including header and all line items.
     
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 
 from .regex_patterns import (
     DATE_PATTERNS,
@@ -46,23 +46,61 @@ def is_field_weak(value) -> bool:
 
 # Generic helpers
 
-def _find_first(patterns: List[str], text: str) -> str:
+def _label_amount_regexes(label_patterns: List[re.Pattern]) -> List[re.Pattern]:
+    """Compile label + optional separator + amount regexes once per label list"""
+    # Separators vary (colon, dash, space) across receipt formats
+    return [
+        re.compile(rf"{label.pattern}\s*[:\-]?\s*({AMOUNT_PATTERN.pattern})", re.IGNORECASE)
+        for label in label_patterns
+    ]
+
+
+_SUBTOTAL_AMOUNT_REGEXES = _label_amount_regexes(SUBTOTAL_LABEL_PATTERNS)
+_TOTAL_AMOUNT_REGEXES = _label_amount_regexes(TOTAL_LABEL_PATTERNS)
+_TAX_AMOUNT_REGEXES = _label_amount_regexes(TAX_PATTERNS)
+
+# Currency and payment keywords fused into one alternation so a single scan of
+# the OCR text finds every label present; group names map back to the labels
+_DETECTION_LABELS = {
+    f"g{idx}": label
+    for idx, label in enumerate([*CURRENCY_PATTERNS, *PAYMENT_METHOD_PATERNS])
+}
+_DETECTION_REGEX = re.compile(
+    "|".join(
+        f"(?P<g{idx}>{pattern.pattern})"
+        for idx, pattern in enumerate([*CURRENCY_PATTERNS.values(), *PAYMENT_METHOD_PATERNS.values()])
+    ),
+    re.IGNORECASE,
+)
+
+
+def _detect_labels(text: str) -> Set[str]:
+    """Return every currency/payment label whose pattern occurs in the text"""
+    return {_DETECTION_LABELS[match.lastgroup] for match in _DETECTION_REGEX.finditer(text)}
+
+
+def _first_detected(patterns: Dict, detected: Set[str]) -> str:
+    """Pick the highest-priority label (dict order) among the detected ones"""
+    for label in patterns:
+        if label in detected:
+            return label
+    return ""
+
+
+def _find_first(patterns: List[re.Pattern], text: str) -> str:
     """Try each pattern until one matches, return first match found"""
     # Patterns ordered by specificity; first match usually most reliable
     for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return ""
 
 
-def _find_amount_after_label(label_patterns: List[str], text: str) -> float:
+def _find_amount_after_label(amount_regexes: List[re.Pattern], text: str) -> float:
     """Find monetary amount after a label (e.g., 'Total: $50.00')"""
-    for label in label_patterns:
-        # Build regex: label + optional separator + amount pattern
-        # Separators vary (colon, dash, space) across receipt formats
-        regex = rf"{label}\s*[:\-]?\s*({AMOUNT_PATTERN})"
-        match = re.search(regex, text, re.IGNORECASE)
+    for regex in amount_regexes:
+        match = regex.search(text)
         if match:
             # Remove commas before converting (1,000.50 -> 1000.50)
             return float(match.group(1).replace(",", ""))
@@ -82,36 +120,34 @@ def extract_time(text: str) -> str:
 def extract_invoice_number(text: str) -> str:
     """Extract invoice/bill/receipt number from text"""
     for pattern in INVOICE_PATTERNS:
-        match = re.search(pattern, text, re.IGNORECASE)
+        match = pattern.search(text)
         if match:
-            return match.group(2)  # Group 2 contains the actual number
+            return match.group(pattern.groups)  # Last group contains the actual number
     return ""
 
 
-def extract_currency(text: str) -> str:
+def extract_currency(text: str, detected: Optional[Set[str]] = None) -> str:
     """Detect currency from symbols ($, ₹, €) or codes (USD, INR, EUR)"""
     # Match currency symbols before codes; symbols are more visually distinct in OCR
-    for currency, pattern in CURRENCY_PATTERNS.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            return currency
-    return ""
+    if detected is None:
+        detected = _detect_labels(text)
+    return _first_detected(CURRENCY_PATTERNS, detected)
 
 
-def extract_payment_method(text: str) -> str:
+def extract_payment_method(text: str, detected: Optional[Set[str]] = None) -> str:
     """Identify payment method from keywords (CASH, CARD, UPI, etc.)"""
     # Used for expense tracking and reconciliation with payment records
-    for method, pattern in PAYMENT_METHOD_PATERNS.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            return method  # Return standardized payment method name
-    return ""  # Unknown payment method
+    if detected is None:
+        detected = _detect_labels(text)
+    # Standardized payment method name, or "" when unknown
+    return _first_detected(PAYMENT_METHOD_PATERNS, detected)
 
 
 def extract_tax(text: str) -> float:
     """Extract tax amount from various tax labels (TAX, GST, VAT, etc.)"""
-    for label in TAX_PATTERNS:
-        # Build regex to find amount after tax label
-        regex = rf"{label}\s*[:\-]?\s*({AMOUNT_PATTERN})"
-        match = re.search(regex, text, re.IGNORECASE)
+    for regex in _TAX_AMOUNT_REGEXES:
+        # Find amount after tax label
+        match = regex.search(text)
         if match:
             # Clean and convert amount to float
             return float(match.group(1).replace(",", ""))
@@ -119,18 +155,18 @@ def extract_tax(text: str) -> float:
 
 
 def extract_subtotal(text: str) -> float:
-    return _find_amount_after_label(SUBTOTAL_LABEL_PATTERNS, text)
+    return _find_amount_after_label(_SUBTOTAL_AMOUNT_REGEXES, text)
 
 
 def extract_total(text: str) -> float:
-    return _find_amount_after_label(TOTAL_LABEL_PATTERNS, text)
+    return _find_amount_after_label(_TOTAL_AMOUNT_REGEXES, text)
 
 
 def extract_line_items(text: str) -> List[Dict]:
     """Extract itemized list from receipt (s_no, name, qty, price)"""
     items = []
     # Find all matches of line item pattern in text
-    matches = re.findall(LINE_ITEM_PATTERN, text, re.IGNORECASE)
+    matches = LINE_ITEM_PATTERN.findall(text)
 
     # Convert each match to structured dictionary
     for idx, match in enumerate(matches, start=1):
@@ -152,14 +188,16 @@ def extract_fields_from_ocr(ocr_text: str) -> Dict:
     """
     Extract raw fields from OCR text.
     """
+    # One scan finds both currency and payment keywords
+    detected = _detect_labels(ocr_text)
 
     return {
         "invoice_number": extract_invoice_number(ocr_text),
         "vendor_name": "",  # vendor often needs NLP → left for later stage
         "purchase_date": extract_date(ocr_text),
         "purchase_time": extract_time(ocr_text),
-        "currency": extract_currency(ocr_text),
-        "payment_method": extract_payment_method(ocr_text),
+        "currency": extract_currency(ocr_text, detected),
+        "payment_method": extract_payment_method(ocr_text, detected),
         "tax_amount": extract_tax(ocr_text),
         "subtotal": extract_subtotal(ocr_text),
         "total_amount": extract_total(ocr_text),
@@ -1,106 +1,196 @@
+import re
+from functools import lru_cache
+from math import floor
 from typing import Dict, List
-from datetime import datetime
+from datetime import datetime, time
 
 # Utility helpers to normalize OCR/Gemini outputs into DB-friendly shapes
 
+# H:M[:S] with an optional AM/PM suffix (what the old strptime formats accepted)
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?(?:\s+([AP]M))?", re.IGNORECASE)
+
+# ISO-ordered or day-first dates; the backreference keeps separators consistent
+_DATE_RE = re.compile(
+    r"\s*(?:(\d{4})-(\d{1,2})-(\d{1,2})|(\d{1,2})([/.-])(\d{1,2})\5(\d{4}))\s*",
+    re.ASCII,
+)
+
 # Safe converters
 
 def _safe_str(value, default=""):
     """Convert value to string safely, handling None and empty values"""
     # Prevents None.strip() errors and normalizes whitespace
-    return str(value).strip() if value else default
+    if not value:
+        return default
+    # Strings (nearly every OCR/Gemini field) skip the redundant str() call
+    return value.strip() if type(value) is str else str(value).strip()
+
+
+# Thousands separators and currency symbols OCR leaves in amounts ("₹1,000.50")
+_NUMBER_NOISE = str.maketrans("", "", ",$₹€£")
 
 
 def _safe_float(value, default=0.0):
     """Convert value to float safely, returning default on error"""
+    # Numbers (the usual Gemini output) skip the exception machinery entirely
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    if value is None or value == "":
+        return default
+
     # Handles string numbers from OCR ("100.50" -> 100.5) without crashing
     try:
-        return float(value)
+        return float(value.translate(_NUMBER_NOISE) if value_type is str else value)
     except (TypeError, ValueError):
         return default
 
 
+# Money helpers
+# Amounts are rounded once to integer cents so derived values (item totals, a
+# computed subtotal) are exact; they become floats again only for storage
+
+def _to_cents(amount: float) -> int:
+    """Round an amount half-up to whole cents; non-finite amounts count as 0"""
+    try:
+        return floor(amount * 100 + 0.5)
+    except (ValueError, OverflowError):
+        return 0
+
+
+def _from_cents(cents: int) -> float:
+    """Convert integer cents back to a 2-decimal float for the database"""
+    return cents / 100
+
+
 # Date & time normalization
+# Both normalizers are pure, so results are memoized; batch imports repeat the
+# same date/time strings heavily and the bounded caches cap memory use
 
+@lru_cache(maxsize=4096)
 def _normalize_date(date_str: str) -> str:
     """Convert various date formats to YYYY-MM-DD for database storage"""
     if not date_str:
         return ""
 
-    # Try common date formats found in receipts (ordered by likelihood)
-    formats = [
-        "%Y-%m-%d",    # ISO format: 2024-01-15
-        "%d/%m/%Y",    # DD/MM/YYYY: 15/01/2024
-        "%d-%m-%Y",    # DD-MM-YYYY: 15-01-2024
-        "%d.%m.%Y",    # DD.MM.YYYY: 15.01.2024
-    ]
-
-    # Attempt parsing with each format; first match wins
-    for fmt in formats:
+    # Fast path for ISO dates (Gemini's usual output), including ISO datetimes;
+    # week dates and the compact YYYYMMDD form are left to the regex below
+    if date_str[4:5] == "-" and date_str[7:8] == "-":
+        if date_str.endswith("Z"):
+            date_str = date_str[:-1] + "+00:00"
         try:
-            # Convert to standard database format regardless of input format
-            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+            return datetime.fromisoformat(date_str).date().isoformat()
         except ValueError:
             pass
 
-    return ""
+    # One match covers the common receipt formats (YYYY-M-D, D/M/YYYY,
+    # D-M-YYYY, D.M.YYYY) instead of trying strptime once per format
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return ""
+    if match.group(1):
+        year, month, day = match.group(1, 2, 3)
+    else:
+        day, month, year = match.group(4, 6, 7)
+
+    # Validate the calendar date (rejects 2024-02-30, month 13, ...)
+    try:
+        parsed = datetime(int(year), int(month), int(day))
+    except ValueError:
+        return ""
+    return parsed.date().isoformat()
 
 
+@lru_cache(maxsize=4096)
 def _normalize_time(time_str: str) -> str:
     """Normalize time to HH:MM:SS format for database TIME type compatibility"""
+    # Strip once up front; every parse below works on the trimmed value and
+    # whitespace-only input returns before any parsing is attempted
+    time_str = time_str.strip() if time_str else ""
     if not time_str:
         return ""
-    
-    # Try datetime.strptime first for strict format matching
-    for fmt in ("%H:%M:%S", "%H:%M", "%I:%M %p", "%I:%M:%S %p"):
+
+    # Fast path for ISO times (HH:MM, HH:MM:SS, optional fraction/offset)
+    if time_str[2:3] == ":":
+        iso_time = time_str[:-1] + "+00:00" if time_str.endswith("Z") else time_str
         try:
-            dt = datetime.strptime(time_str.strip(), fmt)
-            return dt.strftime("%H:%M:%S")
+            parsed = time.fromisoformat(iso_time)
         except ValueError:
             pass
-    
-    # Fallback to regex for flexible formats OCR might produce
-    import re
-    match = re.match(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*$", time_str.strip())
-    if match:
-        hh = int(match.group(1))
-        mm = int(match.group(2))
-        ss = int(match.group(3)) if match.group(3) else 0
-        
-        # Validate ranges to catch parsing errors
-        if 0 <= hh <= 23 and 0 <= mm <= 59 and 0 <= ss <= 59:
-            return f"{hh:02d}:{mm:02d}:{ss:02d}"
-    
+        else:
+            # Plain HH:MM:SS is already canonical; skip the strftime round-trip
+            if len(time_str) == 8 and time_str[5] == ":":
+                return time_str
+            return parsed.strftime("%H:%M:%S")
+
+    # One match covers H:M, H:M:S and their 12-hour AM/PM forms instead of
+    # trying strptime once per format
+    match = _TIME_RE.fullmatch(time_str)
+    if not match:
+        return ""
+    hours, minutes, seconds, meridiem = match.groups()
+    hh, mm, ss = int(hours), int(minutes), int(seconds or 0)
+
+    if meridiem:
+        # 12-hour clock: 12 AM is midnight, 12 PM is noon
+        if not 1 <= hh <= 12:
+            return ""
+        hh = hh % 12 + (12 if meridiem.upper() == "PM" else 0)
+
+    # Validate ranges to catch parsing errors
+    if hh <= 23 and mm <= 59 and ss <= 59:
+        return "%02d:%02d:%02d" % (hh, mm, ss)
     return ""
 
 # Line item normalization
 
 def normalize_items(items: List[Dict]) -> List[Dict]:
     """Normalize line items with safe type conversions and calculations"""
-    normalized = []
-
-    for idx, item in enumerate(items, start=1):
-        # Safe conversion handles OCR strings like "2.5" or "qty: 3"
-        quantity = _safe_float(item.get("quantity"))
-        unit_price = _safe_float(item.get("unit_price"))
+    # Header-only receipts (no or null items array) skip the per-item setup
+    if not items:
+        return []
+
+    # Local aliases keep helper lookups out of the per-item global namespace
+    safe_float = _safe_float
+    safe_str = _safe_str
+    to_cents = _to_cents
+    from_cents = _from_cents
+
+    # Safe conversion handles OCR strings like "2.5" or "qty: 3"; item_total
+    # falls back to quantity * unit_price when Gemini didn't provide it
+    return [
+        {
+            "s_no": item.get("s_no", idx),
+            "item_name": safe_str(item.get("item_name")).upper(),
+            "quantity": (quantity := safe_float(item.get("quantity"))),
+            "unit_price": (unit_price := safe_float(item.get("unit_price"))),
+            "item_total": from_cents(to_cents(  # Consistent precision
+                quantity * unit_price if (item_total := item.get("item_total")) is None
+                else item_total if type(item_total) is float  # Already numeric from Gemini
+                else safe_float(item_total)
+            )),
+        }
+        for idx, item in enumerate(items, start=1)
+    ]
 
-        # Calculate item_total if Gemini didn't provide it (catches OCR errors)
-        item_total = item.get("item_total")
-        if item_total is None:
-            item_total = quantity * unit_price
 
-        normalized.append({
-            "s_no": item.get("s_no", idx),
-            "item_name": _safe_str(item.get("item_name")).upper(),
-            "quantity": quantity,
-            "unit_price": unit_price,
-            "item_total": round(_safe_float(item_total), 2),  # Consistent precision
-        })
+# Main normalizer
 
-    return normalized
+# Values Gemini usually returns already normalized; these skip strip/upper/slice
+_CANONICAL_CURRENCIES = frozenset({"USD", "INR", "MYR", "EUR", "GBP"})
+_CANONICAL_PAYMENT_METHODS = frozenset({"CASH", "CARD", "UPI", "NET BANKING", "WALLET"})
 
+# (field, default, max_len, canonical values) for text columns, matching the
+# database VARCHAR limits
+_VARCHAR_FIELDS = (
+    ("invoice_number", "", 100, frozenset()),
+    ("vendor_name", "Unknown", 255, frozenset()),
+    ("currency", "USD", 10, _CANONICAL_CURRENCIES),
+    ("payment_method", "", 50, _CANONICAL_PAYMENT_METHODS),
+)
 
-# Main normalizer
 
 def normalize_extracted_fields(extracted: Dict) -> Dict:
     """
@@ -109,30 +199,35 @@ def normalize_extracted_fields(extracted: Dict) -> Dict:
     
     This is called by ocr.py after Gemini extraction to standardize data.
     """
-    # Enforce database VARCHAR length limits to prevent constraint violations
-    invoice_number = _safe_str(extracted.get("invoice_number")).upper()[:100]
-    vendor_name = _safe_str(extracted.get("vendor_name", "Unknown")).upper()[:255]
-    currency = _safe_str(extracted.get("currency", "USD")).upper()[:10]
-    payment_method = _safe_str(extracted.get("payment_method")).upper()[:50]
-    
+    get = extracted.get
+
+    # Enforce database VARCHAR length limits to prevent constraint violations;
+    # text fields are written straight into the result dict
+    normalized = {}
+    for field, default, max_len, canonical in _VARCHAR_FIELDS:
+        value = get(field, default)
+        if type(value) is str and value in canonical:
+            normalized[field] = value
+        else:
+            normalized[field] = _safe_str(value).upper()[:max_len]
+
     # Safe conversion prevents "1000.50" string from crashing calculations
-    subtotal = _safe_float(extracted.get("subtotal"))
-    total_amount = _safe_float(extracted.get("total_amount"))
-    tax_amount = _safe_float(extracted.get("tax_amount"))
-    
-    # Calculate subtotal if missing (needed for validation and reporting)
+    subtotal = _to_cents(_safe_float(get("subtotal")))
+    total_amount = _to_cents(_safe_float(get("total_amount")))
+    tax_amount = _to_cents(_safe_float(get("tax_amount")))
+
+    # Calculate subtotal if missing (needed for validation and reporting);
+    # exact in cents, so subtotal + tax always equals the stored total
     if subtotal == 0 and total_amount > 0:
         subtotal = total_amount - tax_amount
 
-    return {
-        "invoice_number": invoice_number,
-        "vendor_name": vendor_name,
-        "purchase_date": _normalize_date(extracted.get("purchase_date")),
-        "purchase_time": _normalize_time(extracted.get("purchase_time")),
-        "currency": currency,
-        "payment_method": payment_method,
-        "tax_amount": round(tax_amount, 2),
-        "subtotal": round(subtotal, 2),
-        "total_amount": round(total_amount, 2),
-        "items": normalize_items(extracted.get("items", [])),
-    }
+    # Gemini may omit items or send null for header-only receipts
+    items = get("items")
+
+    normalized["purchase_date"] = _normalize_date(get("purchase_date"))
+    normalized["purchase_time"] = _normalize_time(get("purchase_time"))
+    normalized["tax_amount"] = _from_cents(tax_amount)
+    normalized["subtotal"] = _from_cents(subtotal)
+    normalized["total_amount"] = _from_cents(total_amount)
+    normalized["items"] = normalize_items(items) if items else []
+    return normalized
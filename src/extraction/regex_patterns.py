@@ -4,89 +4,96 @@
 
 import re
 
+# All patterns are compiled once at import with IGNORECASE (every caller matches
+# case-insensitively), so extractors call .search()/.findall() directly
+_FLAGS = re.IGNORECASE
+
 # DATE_PATTERNS: Multiple formats needed because OCR quality and regional variations mean
 # receipts from India (DD/MM/YYYY), Europe (DD.MM.YYYY), and US (MM/DD/YYYY) all appear
-# Ordered by likelihood: ISO format most reliable, European separators also common
+# Ordered by likelihood: ISO format most reliable; the day-first formats share one
+# pattern so the text is scanned once for any of the /, - or . separators
 DATE_PATTERNS = [
-    r"\b(\d{4}-\d{2}-\d{2})\b",          # ISO 8601 (most reliable in modern systems)
-    r"\b(\d{2}/\d{2}/\d{4})\b",          # DD/MM/YYYY (India/EU common)
-    r"\b(\d{2}-\d{2}-\d{4})\b",          # DD-MM-YYYY (alternative separator)
-    r"\b(\d{2}\.\d{2}\.{4})\b",          # DD.MM.YYYY (Germany/Europe)
+    re.compile(r"\b(\d{4}-\d{2}-\d{2})\b", _FLAGS),          # ISO 8601 (most reliable in modern systems)
+    re.compile(r"\b(\d{2}([/\-.])\d{2}\2\d{4})\b", _FLAGS),  # DD/MM/YYYY, DD-MM-YYYY, DD.MM.YYYY (same separator)
 ]
 
 # TIME_PATTERNS: HH:MM is checked before HH:MM:SS because OCR often truncates seconds
 # This ensures we capture time even if OCR quality is degraded
 TIME_PATTERNS = [
-    r"\b(\d{2}:\d{2})\b",                # HH:MM (most common on receipts)
-    r"\b(\d{2}:\d{2}:\d{2})\b",          # HH:MM:SS (when available)
+    re.compile(r"\b(\d{2}:\d{2})\b", _FLAGS),        # HH:MM (most common on receipts)
+    re.compile(r"\b(\d{2}:\d{2}:\d{2})\b", _FLAGS),  # HH:MM:SS (when available)
 ]
 
 # INVOICE_PATTERNS: Different receipt vendors use inconsistent labeling
 # (Invoice, Bill, Receipt, INV#, etc). Multiple patterns catch variations
-# Capture group 2 gets the actual number (group 1 is the label)
+# The last capture group holds the actual number (the label is not captured in INV/BILL)
 INVOICE_PATTERNS = [
-    r"(invoice|bill|receipt)[\s-:#]*([A-Z0-9\-\/]+)",  # Flexible label + number
-    r"\bINV[\s\-:]?([A-Z0-9]+)\b",                      # Abbreviated "INV" format
-    r"\bBILL[\s\-:]?([A-Z0-9\-\/]+)\b",                 # Abbreviated "BILL" format
+    re.compile(r"(invoice|bill|receipt)[\s\-:#]*([A-Z0-9\-\/]+)", _FLAGS),  # Flexible label + number
+    re.compile(r"\bINV[\s\-:]?([A-Z0-9]+)\b", _FLAGS),                      # Abbreviated "INV" format
+    re.compile(r"\bBILL[\s\-:]?([A-Z0-9\-\/]+)\b", _FLAGS),                 # Abbreviated "BILL" format
 ]
 
 # CURRENCY_PATTERNS: Dictionary allows symbol-first matching ($ before USD text)
 # Symbols ($, ₹) are more visually distinct in OCR than currency codes
 # Early match prevents ambiguity (e.g., USD $ both in same receipt)
 CURRENCY_PATTERNS = {
-    "USD": r"\bUSD\b|\$",                               # Match symbol first
-    "INR": r"\bINR\b|₹",                                # Indian Rupee symbol more reliable
-    "MYR": r"\bMYR\b|\bRM\b",                            # Malaysian Ringgit
-    "EUR": r"\bEUR\b|€",                                # Euro symbol
-    "GBP": r"\bGBP\b|£",                                # British Pound symbol
+    "USD": re.compile(r"\bUSD\b|\$", _FLAGS),      # Match symbol first
+    "INR": re.compile(r"\bINR\b|₹", _FLAGS),       # Indian Rupee symbol more reliable
+    "MYR": re.compile(r"\bMYR\b|\bRM\b", _FLAGS),  # Malaysian Ringgit
+    "EUR": re.compile(r"\bEUR\b|€", _FLAGS),       # Euro symbol
+    "GBP": re.compile(r"\bGBP\b|£", _FLAGS),       # British Pound symbol
 }
 
 # PAYMENT_METHOD_PATTERNS: Enables expense categorization for accounting/analytics
 # Typo "PATERNS" kept for backward compatibility with existing code
 # Multiple aliases for same method catch OCR variations (PAYTM, PayTM, paytm)
 PAYMENT_METHOD_PATERNS = {
-    "CASH": r"\bCASH\b",                                # Direct payment
-    "CARD": r"\bCARD\b|\bCREDIT\b|\bDEBIT\b",          # Card variants
-    "UPI": r"\bUPI\b",                                  # India-specific (critical market)
-    "NET BANKING": r"\bNET BANKING\b|\bONLINE\b",      # Bank transfers
-    "WALLET": r"\bPAYTM\b|\bPHONEPE\b|\bGPAY\b",       # Popular mobile wallets
+    "CASH": re.compile(r"\bCASH\b", _FLAGS),                           # Direct payment
+    "CARD": re.compile(r"\bCARD\b|\bCREDIT\b|\bDEBIT\b", _FLAGS),      # Card variants
+    "UPI": re.compile(r"\bUPI\b", _FLAGS),                             # India-specific (critical market)
+    "NET BANKING": re.compile(r"\bNET BANKING\b|\bONLINE\b", _FLAGS),  # Bank transfers
+    "WALLET": re.compile(r"\bPAYTM\b|\bPHONEPE\b|\bGPAY\b", _FLAGS),   # Popular mobile wallets
 }
 
 # TAX_PATTERNS: Tax detection enables invoice validation (total = subtotal + tax)
 # Different regions: India (GST/CGST/SGST), Europe (VAT), US (Tax)
 # Order: specific (CGST/SGST) before generic (GST) to avoid false matches
 TAX_PATTERNS = [
-    r"\bTAX\b",                                         # Generic fallback
-    r"\bGST\b",                                         # India nationwide
-    r"\bVAT\b",                                         # Europe/UK
-    r"\bCGST\b",                                        # Central GST (India)
-    r"\bSGST\b",                                        # State GST (India)
-    r"\bIGST\b",                                        # Integrated GST (India)
+    re.compile(r"\bTAX\b", _FLAGS),   # Generic fallback
+    re.compile(r"\bGST\b", _FLAGS),   # India nationwide
+    re.compile(r"\bVAT\b", _FLAGS),   # Europe/UK
+    re.compile(r"\bCGST\b", _FLAGS),  # Central GST (India)
+    re.compile(r"\bSGST\b", _FLAGS),  # State GST (India)
+    re.compile(r"\bIGST\b", _FLAGS),  # Integrated GST (India)
 ]
 
 # TOTAL_LABEL_PATTERNS: Identifies final payable amount
 # Different receipts use different terminology depending on context
 # Critical for validation: total_amount field must be detected accurately
 TOTAL_LABEL_PATTERNS = [
-    r"\bTOTAL\b",                                       # Most common
-    r"\bAMOUNT DUE\b",                                  # Invoices often use this
-    r"\bGRAND TOTAL\b",                                 # Itemized receipts
+    re.compile(r"\bTOTAL\b", _FLAGS),        # Most common
+    re.compile(r"\bAMOUNT DUE\b", _FLAGS),   # Invoices often use this
+    re.compile(r"\bGRAND TOTAL\b", _FLAGS),  # Itemized receipts
 ]
 
 # SUBTOTAL_LABEL_PATTERNS: Detects pre-tax amount needed for validation logic
 # Distinguishes: subtotal + tax = total (tax-exclusive model)
 # vs: subtotal = total (tax-inclusive model, common in India)
 SUBTOTAL_LABEL_PATTERNS = [
-    r"\bSUBTOTAL\b",                                    # Standard spelling
-    r"\bSUB TOTAL\b",                                   # Space variant
+    re.compile(r"\bSUBTOTAL\b", _FLAGS),   # Standard spelling
+    re.compile(r"\bSUB TOTAL\b", _FLAGS),  # Space variant
 ]
 
 # AMOUNT_PATTERN: Matches currency values with thousand separators
 # Handles 1000, 1,000, 1000.00 variations across different locales
 # Non-capturing groups (?:) improve performance vs capturing groups
-AMOUNT_PATTERN = r"\b\d{1,3}(?:,\d{3})*(?:\.\d{2})?\b"
+# Repetition is bounded (up to 10 integer digits) so long OCR digit/comma runs
+# cannot make a failed match rescan arbitrarily far
+AMOUNT_PATTERN = re.compile(r"\b(?:\d{1,3}(?:,\d{3}){1,4}|\d{1,10})(?:\.\d{2})?\b", _FLAGS)
 
 # LINE_ITEM_PATTERN: Parses individual line items (product lines on receipt)
 # Format: serial_no + item_name + quantity + unit_price
 # Note: High variance in receipt formats; may need regex tuning per vendor
-LINE_ITEM_PATTERN = r"(\d+)\s+([A-Z0-9\s\-\.]+)\s+(\d+(?:\.\d+)?)\s+(\d+(?:\.\d+)?)"
\ No newline at end of file
+# Separators are spaces/tabs only so a match never spans lines: one item per
+# receipt line, and backtracking on OCR garbage is bounded by the line length
+LINE_ITEM_PATTERN = re.compile(r"(\d+)[ \t]+([A-Z0-9 \t\-\.]+)[ \t]+(\d+(?:\.\d+)?)[ \t]+(\d+(?:\.\d+)?)", _FLAGS)
\ No newline at end of file
@@ -110,7 +110,7 @@ def _find_first(patterns: List[str], text: str) -> str:
 def _find_amount_after_label(label_patterns: List[str], text: str) -> float:
     """Find a currency amount that follows any of the given label patterns."""
     for label in label_patterns:
-        regex = rf"{label}\s*[:\-]?\s*({AMOUNT_PATTERN})"
+        regex = rf"{label}\s*[:\-]?\s*({AMOUNT_PATTERN.pattern})"
         match = re.search(regex, text, re.IGNORECASE)
         if match:
             return float(match.group(1).replace(",", ""))